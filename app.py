@@ -3,10 +3,13 @@ import pandas as pd
 import numpy as np
 from typing import List, Dict, Tuple
 import os
-from utils.file_processor import FileProcessor
+from utils.file_processor import ARCHIVE_SUFFIXES, FileProcessor
 from utils.embedding_service import EmbeddingService
 from utils.similarity_calculator import SimilarityCalculator
 from utils.ai_summarizer import AISummarizer
+from utils.cache import LRUCache
+from utils.deduplication import NearDuplicateDetector
+from utils.bm25 import BM25Index
 
 # Configure Streamlit page
 st.set_page_config(page_title="Job Candidate Recommendation System",
@@ -20,15 +23,70 @@ if 'analysis_results' not in st.session_state:
     st.session_state.analysis_results = None
 
 
+# Corpus-level vectorizer built with build_vectorizer.py
+EMBEDDING_MODEL_PATH = os.getenv("EMBEDDING_MODEL_PATH",
+                                 "models/tfidf_vectorizer.joblib")
+
+
+# Optional directory for the on-disk embedding cache tier
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR")
+
+
+# Optional directory for the on-disk tier of the text extraction cache
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR")
+
+
+# Chunked scoring reads at most CHUNK_MAX_CHUNKS windows of CHUNK_SIZE tokens
+CHUNK_SIZE = 256
+CHUNK_MAX_CHUNKS = 8
+
+
+# PDF extraction stops after this many pages or once this many words are
+# collected; chunked scoring reads at most CHUNK_SIZE * CHUNK_MAX_CHUNKS tokens
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+PDF_MAX_WORDS = int(os.getenv("PDF_MAX_WORDS", "3000"))
+
+
 # Initialize services
 @st.cache_resource
 def initialize_services():
     """Initialize all services with caching for better performance"""
-    file_processor = FileProcessor()
-    embedding_service = EmbeddingService()
+    # Every rerun re-submits the uploads; unchanged files come from the cache
+    extraction_cache = LRUCache(max_entries=2000, disk_dir=EXTRACTION_CACHE_DIR)
+    file_processor = FileProcessor(cache=extraction_cache,
+                                   pdf_max_pages=PDF_MAX_PAGES,
+                                   pdf_max_words=PDF_MAX_WORDS)
+    # Sparse mode keeps TF-IDF vectors as CSR matrices through scoring
+    if os.path.exists(EMBEDDING_MODEL_PATH):
+        # Repeated resumes are served from the cache instead of re-transformed;
+        # only a fixed model keeps its fingerprint, and so its cache keys,
+        # from one analysis to the next
+        embedding_cache = LRUCache(max_entries=20000,
+                                   disk_dir=EMBEDDING_CACHE_DIR)
+        # Shared by every session, so freeze it to a read-only model
+        embedding_service = EmbeddingService.from_saved_vectorizer(
+            EMBEDDING_MODEL_PATH, sparse_output=True,
+            cache=embedding_cache).freeze()
+    else:
+        # Each analysis fits its own scoped model, which would never hit a cache
+        embedding_service = EmbeddingService(sparse_output=True)
     similarity_calculator = SimilarityCalculator()
     ai_summarizer = AISummarizer()
-    return file_processor, embedding_service, similarity_calculator, ai_summarizer
+    duplicate_detector = NearDuplicateDetector()
+    return (file_processor, embedding_service, similarity_calculator,
+            ai_summarizer, duplicate_detector)
+
+
+@st.cache_resource(max_entries=16)
+def get_bm25_index(corpus_key: str, _texts: tuple) -> BM25Index:
+    """
+    Fit BM25 statistics once per distinct set of resumes
+
+    corpus_key is a content hash of _texts (which Streamlit does not hash
+    itself), so re-running an analysis on the same uploads, e.g. with a
+    different job description or weight, reuses the fitted index.
+    """
+    return BM25Index().fit(list(_texts))
 
 
 def show_search_page():
@@ -258,7 +316,7 @@ def show_search_page():
 
     # Initialize services
     try:
-        file_processor, embedding_service, similarity_calculator, ai_summarizer = initialize_services(
+        file_processor, embedding_service, similarity_calculator, ai_summarizer, duplicate_detector = initialize_services(
         )
     except Exception as e:
         st.error(f"Failed to initialize services: {str(e)}")
@@ -274,6 +332,30 @@ def show_search_page():
             value=10,
             help="Select how many top candidates to display")
 
+        score_full_resume = st.checkbox(
+            "Score full resumes in chunks",
+            value=False,
+            help=
+            "Score every page of long resumes in fixed-size chunks and keep each candidate's best chunk, instead of only the first 512 words"
+        )
+
+        bm25_weight = st.slider(
+            "Keyword match (BM25) weight",
+            min_value=0.0,
+            max_value=1.0,
+            value=0.0,
+            step=0.1,
+            help=
+            "Blend TF-IDF similarity with BM25 keyword scores, which normalize for resume length; 0 uses TF-IDF only"
+        )
+
+        collapse_duplicates = st.checkbox(
+            "Collapse near-duplicate resumes",
+            value=True,
+            help=
+            "Score and summarize near-identical resumes (e.g. the same candidate submitted by several agencies) once, and give every copy the same score"
+        )
+
         # Check if AI summarizer is available
         ai_available = ai_summarizer.is_available
         provider_info = ai_summarizer.get_provider_info()
@@ -333,30 +415,38 @@ def show_search_page():
             st.markdown("**Drag and drop your files or click to browse:**")
             uploaded_files = st.file_uploader(
                 "Upload resume files",
-                type=['pdf', 'txt', 'docx'],
+                # Multi-part suffixes such as tar.gz are matched on the whole
+                # suffix, so bare .gz files are not offered
+                type=['pdf', 'txt', 'docx'] +
+                [suffix.lstrip('.') for suffix in ARCHIVE_SUFFIXES],
                 accept_multiple_files=True,
                 help=
-                "✅ Supported formats: PDF, TXT, DOCX | 📁 Multiple files allowed"
+                "✅ Supported formats: PDF, TXT, DOCX, or ZIP/TAR archives of them"
+                " | 📁 Multiple files allowed"
             )
 
             if uploaded_files:
                 with st.spinner("🔄 Processing uploaded files..."):
                     progress_text = st.empty()
-                    for i, uploaded_file in enumerate(uploaded_files):
+
+                    def show_progress(completed, total, name, error):
                         progress_text.text(
-                            f"Processing {uploaded_file.name}...")
-                        try:
-                            content = file_processor.process_file(
-                                uploaded_file)
-                            if content.strip():
-                                resumes_data.append({
-                                    'name': uploaded_file.name,
-                                    'content': content
-                                })
-                        except Exception as e:
+                            f"Processed {completed}/{total}: {name}")
+
+                    # Files and archive members are extracted in parallel;
+                    # results keep upload order
+                    extracted = file_processor.process_files_parallel(
+                        uploaded_files, progress_callback=show_progress)
+                    for result in extracted:
+                        if result['error']:
                             st.error(
-                                f"❌ Error processing {uploaded_file.name}: {str(e)}"
+                                f"❌ Error processing {result['name']}: {result['error']}"
                             )
+                        elif result['content'].strip():
+                            resumes_data.append({
+                                'name': result['name'],
+                                'content': result['content']
+                            })
 
                     progress_text.empty()
 
@@ -432,49 +522,90 @@ def show_search_page():
                 progress_bar = st.progress(0,
                                            text="Preparing text analysis...")
 
-                # Prepare all texts for fitting the vectorizer
-                all_texts = [job_description] + [
-                    resume['content'] for resume in resumes_data
-                ]
-
-                # Fit the vectorizer with all texts for better vocabulary
-                progress_bar.progress(25, text="Training text analyzer...")
-                embedding_service.fit_vectorizer(all_texts)
+                # Near-duplicate resumes are embedded and scored once, via
+                # the first resume of their cluster
+                resume_texts = [resume['content'] for resume in resumes_data]
+                if collapse_duplicates:
+                    progress_bar.progress(
+                        10, text="Collapsing near-duplicate resumes...")
+                    representatives = duplicate_detector.find_clusters(
+                        resume_texts)
+                else:
+                    representatives = np.arange(len(resume_texts))
+                unique_indices, cluster_slots = np.unique(representatives,
+                                                          return_inverse=True)
+                unique_texts = [resume_texts[i] for i in unique_indices]
+
+                # Without a saved corpus-level model, fall back to fitting
+                # a request-scoped copy on this job and its resumes so the
+                # shared service is never mutated by concurrent sessions
+                request_embedding_service = embedding_service
+                if not embedding_service.read_only:
+                    all_texts = [job_description] + unique_texts
+
+                    # In chunk mode, fit on every chunk that will be scored so
+                    # terms past the first page get a vocabulary entry and IDF
+                    fit_kwargs = {}
+                    if score_full_resume:
+                        fit_kwargs['max_tokens'] = CHUNK_SIZE * CHUNK_MAX_CHUNKS
+
+                    progress_bar.progress(25, text="Training text analyzer...")
+                    request_embedding_service = embedding_service.fit_scoped(
+                        all_texts, **fit_kwargs)
 
                 # Generate job embedding
                 progress_bar.progress(40, text="Analyzing job description...")
-                job_embedding = embedding_service.generate_embedding(
+                job_embedding = request_embedding_service.generate_embedding(
                     job_description)
 
                 # Generate resume embeddings
                 progress_bar.progress(50, text="Analyzing resumes...")
-                resume_texts = [resume['content'] for resume in resumes_data]
-                resume_embeddings = embedding_service.generate_embeddings_batch(
-                    resume_texts)
+                if score_full_resume:
+                    chunk_embeddings, chunk_owners = request_embedding_service.generate_chunk_embeddings(
+                        unique_texts,
+                        chunk_size=CHUNK_SIZE,
+                        max_chunks=CHUNK_MAX_CHUNKS)
+                else:
+                    resume_embeddings = request_embedding_service.generate_embeddings_batch(
+                        unique_texts)
 
                 # Calculate similarities
                 progress_bar.progress(75, text="Calculating similarities...")
-                similarities = similarity_calculator.calculate_similarities(
-                    job_embedding, resume_embeddings)
-
-                # Combine data and sort by similarity
-                candidates_with_scores = []
-                for i, (resume, similarity) in enumerate(
-                        zip(resumes_data, similarities)):
-                    candidates_with_scores.append({
+                if score_full_resume:
+                    similarities = similarity_calculator.calculate_pooled_similarities(
+                        job_embedding, chunk_embeddings, chunk_owners)
+                else:
+                    similarities = similarity_calculator.calculate_similarities(
+                        job_embedding, resume_embeddings)
+
+                # Optionally blend in BM25 keyword scores over the same resumes
+                if bm25_weight > 0:
+                    bm25_index = get_bm25_index(
+                        LRUCache.make_key(*unique_texts), tuple(unique_texts))
+                    bm25_scores = bm25_index.score(job_description)
+                    similarities = similarity_calculator.calculate_hybrid_similarities(
+                        similarities, bm25_scores,
+                        bm25_index.max_score(job_description),
+                        bm25_weight=bm25_weight)
+
+                # Fan each cluster's score back out to all of its members
+                similarities = np.asarray(similarities)[cluster_slots]
+
+                # Select the top N candidates without sorting the whole pool
+                top_indices, top_scores = similarity_calculator.get_top_k(
+                    similarities, num_candidates)
+
+                top_candidates = []
+                for i, similarity in zip(top_indices, top_scores):
+                    resume = resumes_data[i]
+                    top_candidates.append({
                         'name': resume['name'],
                         'content': resume['content'],
-                        'similarity': similarity,
-                        'rank': i + 1
+                        'similarity': float(similarity),
+                        'rank': int(i) + 1,
+                        'cluster': int(representatives[i])
                     })
 
-                # Sort by similarity (descending)
-                candidates_with_scores.sort(key=lambda x: x['similarity'],
-                                            reverse=True)
-
-                # Take top N candidates
-                top_candidates = candidates_with_scores[:num_candidates]
-
                 progress_bar.progress(100, text="Analysis complete!")
                 progress_bar.empty()
 
@@ -679,6 +810,9 @@ def show_results_page():
     # Enhanced candidate display section
     st.markdown("---")
 
+    # Near-duplicate candidates share one AI summary per cluster
+    cluster_summaries = {}
+
     for i, candidate in enumerate(results['top_candidates']):
         # Determine score styling
         score_percentage = candidate['similarity'] * 100
@@ -797,10 +931,13 @@ def show_results_page():
                         f"🤖 Generating AI analysis for {candidate['name']}..."
                 ):
                     try:
-                        summary = results[
-                            'ai_summarizer'].generate_fit_summary(
-                                results['job_description'],
-                                candidate['content'], candidate['similarity'])
+                        if candidate['cluster'] not in cluster_summaries:
+                            cluster_summaries[candidate['cluster']] = results[
+                                'ai_summarizer'].generate_fit_summary(
+                                    results['job_description'],
+                                    candidate['content'],
+                                    candidate['similarity'])
+                        summary = cluster_summaries[candidate['cluster']]
 
                         st.markdown(f"""
                         <div style="
@@ -0,0 +1,368 @@
+"""
+Performance benchmarks for the embedding and similarity pipeline.
+
+Runs on synthetic resumes so results are reproducible without real data.
+
+Usage:
+    python benchmark.py preprocess --docs 10000
+    python benchmark.py quantization --docs 20000 --queries 50
+    python benchmark.py parallel --docs 50000 --workers 1 2 4
+    python benchmark.py bm25 --docs 50000 --queries 50
+    python benchmark.py chunked --docs 200000 --block-sizes 1024 8192 --threads 1 2 4
+"""
+import argparse
+import multiprocessing
+import random
+import resource
+import time
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import TfidfVectorizer
+from utils.bm25 import BM25Index
+from utils.embedding_service import EmbeddingService
+from utils.quantization import SUPPORTED_PRECISIONS, QuantizedEmbeddings
+from utils.similarity_calculator import SimilarityCalculator
+
+SKILLS = [
+    "Python", "Java", "JavaScript", "TypeScript", "React", "Node.js", "Django",
+    "Flask", "Spring Boot", "SQL", "PostgreSQL", "MongoDB", "AWS", "Azure",
+    "GCP", "Docker", "Kubernetes", "Terraform", "CI/CD", "Git", "Pandas",
+    "NumPy", "scikit-learn", "TensorFlow", "PyTorch", "Spark", "Kafka",
+    "Tableau", "Excel", "Salesforce", "SAP", "Agile", "Scrum", "Jira",
+    "machine learning", "data analysis", "project management", "REST APIs",
+    "microservices", "unit testing", "customer success", "financial modeling"
+]
+
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Data Scientist",
+    "Data Analyst", "DevOps Engineer", "Product Manager", "Project Manager",
+    "Business Analyst", "Frontend Developer", "Backend Developer",
+    "Machine Learning Engineer", "QA Engineer", "Sales Executive",
+    "Marketing Manager", "Financial Analyst", "Registered Nurse"
+]
+
+COMPANIES = [
+    "Acme Corp", "Globex", "Initech", "Umbrella Health", "Stark Industries",
+    "Wayne Enterprises", "Hooli", "Pied Piper", "Soylent", "Café Résumé Ltd"
+]
+
+VERBS = [
+    "Led", "Built", "Designed", "Implemented", "Owned", "Improved", "Migrated",
+    "Automated", "Delivered", "Mentored", "Launched", "Optimized", "Managed"
+]
+
+OBJECTS = [
+    "a customer-facing platform", "the data pipeline", "internal tooling",
+    "the reporting stack", "a team of five engineers", "the release process",
+    "cloud infrastructure", "the onboarding flow", "quarterly forecasting",
+    "the analytics dashboard", "patient care workflows", "vendor integrations"
+]
+
+RESULTS = [
+    "reducing costs by {n}%", "cutting latency by {n}%",
+    "increasing revenue by {n}%", "serving {n}k daily users",
+    "improving retention by {n}%", "saving {n} hours per week"
+]
+
+
+def make_resume(rng: random.Random) -> str:
+    """Generate one synthetic resume of roughly 300-1200 words"""
+    title = rng.choice(TITLES)
+    skills = rng.sample(SKILLS, rng.randint(6, 14))
+    lines = [
+        f"Candidate {rng.randint(1000, 99999)}",
+        f"{title} | candidate{rng.randint(1, 9999)}@example.com",
+        "",
+        "SUMMARY",
+        f"{title} with {rng.randint(1, 20)} years of experience in "
+        f"{', '.join(skills[:4])}.",
+        "",
+        "EXPERIENCE"
+    ]
+
+    for _ in range(rng.randint(2, 6)):
+        lines.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} "
+                     f"({rng.randint(2005, 2020)} - {rng.randint(2021, 2025)})")
+        for _ in range(rng.randint(4, 10)):
+            result = rng.choice(RESULTS).format(n=rng.randint(5, 60))
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using "
+                         f"{rng.choice(skills)} and {rng.choice(skills)}, "
+                         f"{result}.")
+
+    lines.extend(["", "SKILLS", ", ".join(skills), "", "EDUCATION",
+                  f"B.Sc. Computer Science, University {rng.randint(1, 50)}"])
+    return "\n".join(lines)
+
+
+def make_corpus(num_docs: int, seed: int = 42) -> list:
+    """Generate a reproducible list of synthetic resumes"""
+    rng = random.Random(seed)
+    return [make_resume(rng) for _ in range(num_docs)]
+
+
+def legacy_preprocess(text: str) -> str:
+    """The whitespace-split preprocessing the embedding service used to do"""
+    processed = text.strip()
+    processed = ' '.join(processed.split())
+    max_length = 512
+    if len(processed.split()) > max_length:
+        processed = ' '.join(processed.split()[:max_length])
+    return processed
+
+
+def timed(func, *args):
+    """Run func(*args) and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def report(label: str, stages: list, num_docs: int):
+    """Print per-stage and total timings for one pipeline"""
+    total = sum(seconds for _, seconds in stages)
+    breakdown = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in stages)
+    print(f"{label:<12} total {total:6.2f}s ({num_docs / total:,.0f} docs/s): "
+          f"{breakdown}")
+
+
+def benchmark_preprocess(args):
+    """Compare legacy string preprocessing with single-pass tokenization"""
+    texts = make_corpus(args.docs)
+    words = sum(len(text.split()) for text in texts)
+    print(f"{len(texts)} resumes, {words / len(texts):.0f} words on average")
+
+    # Legacy path: split up to three times, then TF-IDF tokenizes for fit
+    # and again for transform
+    vectorizer = TfidfVectorizer(max_features=5000,
+                                 stop_words='english',
+                                 ngram_range=(1, 2),
+                                 lowercase=True,
+                                 strip_accents='unicode')
+    processed, preprocess_time = timed(
+        lambda: [legacy_preprocess(text) for text in texts])
+    _, fit_time = timed(vectorizer.fit, processed)
+    _, transform_time = timed(vectorizer.transform, processed)
+    report("legacy", [("preprocess", preprocess_time), ("fit", fit_time),
+                      ("transform", transform_time)], len(texts))
+
+    # Single-pass path: tokenize once and reuse tokens for fit and transform
+    service = EmbeddingService(sparse_output=True)
+    tokens, tokenize_time = timed(
+        lambda: [service._preprocess_tokens(text) for text in texts])
+    _, fit_time = timed(service._fit, tokens)
+    _, transform_time = timed(service._transform, tokens)
+    report("single-pass", [("tokenize", tokenize_time), ("fit", fit_time),
+                           ("transform", transform_time)], len(texts))
+
+
+def benchmark_quantization(args):
+    """Recall@k and memory of quantized retrieval against the exact float64 path"""
+    texts = make_corpus(args.docs)
+    jobs = make_corpus(args.queries, seed=7)
+    calculator = SimilarityCalculator()
+
+    backends = [
+        ("tfidf-sparse", EmbeddingService(sparse_output=True)),
+        (f"lsa-{args.dimensions}", EmbeddingService(reduced_dimensions=args.dimensions))
+    ]
+
+    for backend_name, service in backends:
+        service.fit_vectorizer(texts)
+        embeddings = service.generate_embeddings_batch(texts)
+        job_embeddings = [service.generate_embedding(job) for job in jobs]
+
+        # Exact float64 reference ranking
+        if sparse.issparse(embeddings):
+            full = sparse.csr_matrix(embeddings, dtype=np.float64)
+            full_bytes = full.data.nbytes + full.indices.nbytes + full.indptr.nbytes
+        else:
+            full = np.asarray(embeddings, dtype=np.float64)
+            full_bytes = full.nbytes
+        exact = []
+        for job_embedding in job_embeddings:
+            scores = np.asarray(calculator.calculate_similarities(job_embedding, full))
+            exact.append(set(np.argsort(-scores, kind='stable')[:args.k].tolist()))
+
+        print(f"\n{backend_name}: {len(texts)} resumes, float64 {full_bytes / 2**20:.1f} MB")
+        for precision in SUPPORTED_PRECISIONS:
+            quantized = QuantizedEmbeddings(full, precision=precision)
+            for rescore in (0, args.rescore):
+                start = time.perf_counter()
+                recall = 0.0
+                for job_embedding, reference in zip(job_embeddings, exact):
+                    matches = calculator.search_quantized(
+                        job_embedding, quantized,
+                        full_embeddings=full if rescore else None,
+                        top_k=args.k, rescore_candidates=rescore or args.k)
+                    recall += len(reference & {i for i, _ in matches}) / args.k
+                elapsed = (time.perf_counter() - start) / len(jobs)
+                label = f"rescore {rescore}" if rescore else "no rescore"
+                print(f"  {precision:<8} {quantized.nbytes / 2**20:7.1f} MB  "
+                      f"recall@{args.k} {recall / len(jobs):.3f}  "
+                      f"{elapsed * 1000:6.1f} ms/query  ({label})")
+
+
+def benchmark_parallel(args):
+    """Throughput of sharded multi-process embedding by worker count"""
+    texts = make_corpus(args.docs)
+    service = EmbeddingService(sparse_output=True)
+    service.fit_vectorizer(texts[:args.fit_docs])
+    print(f"{len(texts)} resumes, vocabulary fitted on {min(args.fit_docs, len(texts))}")
+
+    _, serial_time = timed(service.generate_embeddings_batch, texts)
+    print(f"  single-thread batch   {len(texts) / serial_time:8,.0f} docs/s")
+
+    for workers in args.workers:
+        _, stats = service.generate_embeddings_parallel(
+            texts, n_workers=workers, shard_size=args.shard_size)
+        print(f"  {stats['workers']:2d} workers, {stats['shards']:3d} shards "
+              f"{stats['docs_per_second']:8,.0f} docs/s")
+
+
+def benchmark_bm25(args):
+    """Per-query latency of BM25 and the TF-IDF cosine path over the full pool"""
+    texts = make_corpus(args.docs)
+    jobs = make_corpus(args.queries, seed=7)
+    calculator = SimilarityCalculator()
+
+    service = EmbeddingService(sparse_output=True)
+    _, cosine_build = timed(service.fit_vectorizer, texts)
+    embeddings, embed_time = timed(service.generate_embeddings_batch, texts)
+    index, bm25_build = timed(BM25Index(embedding_service=service).fit, texts)
+    info = index.get_index_info()
+    print(f"{len(texts)} resumes; TF-IDF fit + embed {cosine_build + embed_time:.2f}s, "
+          f"BM25 index {bm25_build:.2f}s ({info['num_terms']} terms, "
+          f"{info['postings']:,} postings)")
+
+    def cosine_query(job):
+        return calculator.calculate_similarities(
+            service.generate_embedding(job), embeddings)
+
+    def hybrid_query(job):
+        return calculator.calculate_hybrid_similarities(
+            cosine_query(job), index.score(job), index.max_score(job),
+            bm25_weight=0.3)
+
+    def hybrid_rebuild_query(job):
+        # What a query pays when the index is not kept between queries
+        rebuilt = BM25Index(embedding_service=service).fit(texts)
+        return calculator.calculate_hybrid_similarities(
+            cosine_query(job), rebuilt.score(job), rebuilt.max_score(job),
+            bm25_weight=0.3)
+
+    for label, query in (("cosine", cosine_query), ("bm25", index.score),
+                         ("hybrid", hybrid_query),
+                         ("hybrid+build", hybrid_rebuild_query)):
+        latencies = []
+        for job in jobs:
+            scores, elapsed = timed(query, job)
+            calculator.get_top_k(np.asarray(scores), args.k)
+            latencies.append(elapsed)
+        latencies = np.array(latencies) * 1000
+        print(f"  {label:<12} median {np.median(latencies):7.1f} ms/query  "
+              f"p95 {np.percentile(latencies, 95):7.1f} ms/query")
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far, in MB (Linux reports KB)"""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_chunked_config(config: dict, results):
+    """Score one configuration in a fresh process so its peak RSS is its own"""
+    rng = np.random.default_rng(0)
+    # A list of vectors, as EmbeddingService returns in dense mode
+    resumes = list(rng.standard_normal((config['docs'], config['dimensions']),
+                                       dtype=np.float32))
+    job = rng.standard_normal(config['dimensions']).astype(np.float32)
+    calculator = SimilarityCalculator()
+    baseline = peak_rss_mb()
+
+    start = time.perf_counter()
+    for _ in range(config['repeats']):
+        if config['block_size'] is None:
+            calculator.calculate_similarities(job, resumes)
+        else:
+            calculator.calculate_similarities_chunked(
+                job, resumes, block_size=config['block_size'],
+                n_threads=config['threads'], split=config['split'])
+    elapsed = (time.perf_counter() - start) / config['repeats']
+
+    results.put((config['docs'] / elapsed, peak_rss_mb(), peak_rss_mb() - baseline))
+
+
+def benchmark_chunked(args):
+    """Throughput and peak RSS of stacked vs chunked scoring per configuration"""
+    print(f"{args.docs} resumes x {args.dimensions} float32 dimensions, "
+          f"{args.repeats} scoring passes per configuration")
+    configs = [("stacked", None, 1, 'blocks')]
+    for block_size in args.block_sizes:
+        for threads in args.threads:
+            splits = ('blocks', 'blas') if threads > 1 else ('blocks',)
+            for split in splits:
+                label = f"chunk {block_size} x{threads} {split}"
+                configs.append((label, block_size, threads, split))
+
+    # spawn so each configuration starts from a clean peak RSS
+    context = multiprocessing.get_context("spawn")
+    for label, block_size, threads, split in configs:
+        results = context.Queue()
+        config = {'docs': args.docs, 'dimensions': args.dimensions,
+                  'repeats': args.repeats, 'block_size': block_size,
+                  'threads': threads, 'split': split}
+        process = context.Process(target=run_chunked_config, args=(config, results))
+        process.start()
+        docs_per_second, peak, scoring_peak = results.get()
+        process.join()
+        print(f"  {label:<24} {docs_per_second:12,.0f} docs/s  "
+              f"peak RSS {peak:8.1f} MB (+{scoring_peak:7.1f} MB while scoring)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    preprocess = subparsers.add_parser(
+        "preprocess", help="Legacy preprocessing vs single-pass tokenization")
+    preprocess.add_argument("--docs", type=int, default=10000)
+    preprocess.set_defaults(func=benchmark_preprocess)
+
+    quantization = subparsers.add_parser(
+        "quantization", help="Quantized retrieval recall@k and memory")
+    quantization.add_argument("--docs", type=int, default=20000)
+    quantization.add_argument("--queries", type=int, default=50)
+    quantization.add_argument("--k", type=int, default=10)
+    quantization.add_argument("--rescore", type=int, default=200)
+    quantization.add_argument("--dimensions", type=int, default=256)
+    quantization.set_defaults(func=benchmark_quantization)
+
+    parallel = subparsers.add_parser(
+        "parallel", help="Multi-process batch embedding throughput")
+    parallel.add_argument("--docs", type=int, default=50000)
+    parallel.add_argument("--fit-docs", type=int, default=10000)
+    parallel.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parallel.add_argument("--shard-size", type=int, default=2000)
+    parallel.set_defaults(func=benchmark_parallel)
+
+    bm25 = subparsers.add_parser(
+        "bm25", help="BM25 vs TF-IDF cosine query latency")
+    bm25.add_argument("--docs", type=int, default=50000)
+    bm25.add_argument("--queries", type=int, default=50)
+    bm25.add_argument("--k", type=int, default=10)
+    bm25.set_defaults(func=benchmark_bm25)
+
+    chunked = subparsers.add_parser(
+        "chunked", help="Stacked vs chunked scoring throughput and peak RSS")
+    chunked.add_argument("--docs", type=int, default=200000)
+    chunked.add_argument("--dimensions", type=int, default=256)
+    chunked.add_argument("--block-sizes", type=int, nargs="+", default=[1024, 8192])
+    chunked.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4])
+    chunked.add_argument("--repeats", type=int, default=3)
+    chunked.set_defaults(func=benchmark_chunked)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
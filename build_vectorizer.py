@@ -0,0 +1,71 @@
+"""
+Fit the TF-IDF vectorizer once on a reference corpus and save it to disk.
+
+The app loads the saved model at startup (see EMBEDDING_MODEL_PATH in app.py)
+so that scores are comparable between runs and queries only call transform.
+
+Usage:
+    python build_vectorizer.py path/to/resumes --output models/tfidf_vectorizer.joblib
+"""
+import argparse
+import os
+import sys
+from utils.file_processor import FileProcessor
+from utils.embedding_service import EmbeddingService
+
+
+def collect_corpus(corpus_dir: str, file_processor: FileProcessor) -> list:
+    """Extract text from every supported file under corpus_dir"""
+    texts = []
+    for root, _, filenames in os.walk(corpus_dir):
+        for filename in sorted(filenames):
+            extension = filename.split('.')[-1].lower()
+            if extension not in file_processor.supported_formats:
+                continue
+
+            path = os.path.join(root, filename)
+            try:
+                with open(path, 'rb') as corpus_file:
+                    content = file_processor.process_file(corpus_file)
+                if content.strip():
+                    texts.append(content)
+            except Exception as e:
+                print(f"Skipping {path}: {str(e)}", file=sys.stderr)
+
+    return texts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Fit and save a corpus-level TF-IDF vectorizer")
+    parser.add_argument("corpus_dir",
+                        help="Directory of reference documents (PDF, TXT, DOCX)")
+    parser.add_argument("--output",
+                        default="models/tfidf_vectorizer.joblib",
+                        help="Where to save the fitted vectorizer")
+    parser.add_argument("--max-features",
+                        type=int,
+                        default=5000,
+                        help="Maximum number of TF-IDF features")
+    parser.add_argument("--dimensions",
+                        type=int,
+                        default=None,
+                        help="Project to this many LSA dimensions (e.g. 256)")
+    args = parser.parse_args()
+
+    texts = collect_corpus(args.corpus_dir, FileProcessor())
+    if not texts:
+        parser.error(f"No usable documents found in {args.corpus_dir}")
+
+    embedding_service = EmbeddingService(max_features=args.max_features,
+                                         reduced_dimensions=args.dimensions)
+    embedding_service.fit_vectorizer(texts)
+    fingerprint = embedding_service.save_vectorizer(args.output)
+
+    print(f"Fitted on {len(texts)} documents, "
+          f"{embedding_service.get_embedding_dimension()} dimensions")
+    print(f"Saved to {args.output} (fingerprint {fingerprint})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Index a resume directory into a persistent embedding store, incrementally.
+
+Each run only extracts and embeds files that are new or changed since the
+previous run and tombstones the rows of changed or deleted files, so a
+nightly refresh of a large shared folder touches just the day's changes.
+The store is tied to the saved vectorizer (see build_vectorizer.py) by its
+fingerprint; after refitting the model, index into a new store directory.
+
+Usage:
+    python ingest_resumes.py path/to/resumes --store stores/resumes \\
+        --model models/tfidf_vectorizer.joblib
+"""
+import argparse
+import sys
+import time
+from utils.embedding_service import EmbeddingService
+from utils.embedding_store import EmbeddingStore
+from utils.file_processor import MAX_EXTRACTION_WORKERS, FileProcessor
+from utils.resume_indexer import ResumeIndexer
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Incrementally index a resume directory into an embedding store")
+    parser.add_argument("resume_dir",
+                        help="Directory of resumes (PDF, TXT, DOCX), scanned recursively")
+    parser.add_argument("--store",
+                        default="stores/resumes",
+                        help="Embedding store directory (created if missing)")
+    parser.add_argument("--model",
+                        default="models/tfidf_vectorizer.joblib",
+                        help="Saved vectorizer used to embed resumes")
+    parser.add_argument("--workers",
+                        type=int,
+                        default=None,
+                        help="Worker processes for embedding (defaults to the CPU "
+                        f"count); extraction uses at most {MAX_EXTRACTION_WORKERS}")
+    parser.add_argument("--batch-size",
+                        type=int,
+                        default=500,
+                        help="Files extracted and committed per batch")
+    parser.add_argument("--pdf-max-pages",
+                        type=int,
+                        default=None,
+                        help="Stop PDF extraction after this many pages")
+    args = parser.parse_args()
+
+    embedding_service = EmbeddingService.from_saved_vectorizer(
+        args.model, sparse_output=True).freeze()
+    store = EmbeddingStore(args.store, fingerprint=embedding_service.fingerprint)
+    indexer = ResumeIndexer(
+        args.resume_dir, store, embedding_service,
+        file_processor=FileProcessor(pdf_max_pages=args.pdf_max_pages),
+        batch_size=args.batch_size)
+
+    def show_progress(processed, total):
+        print(f"Indexed {processed}/{total} new or changed files", file=sys.stderr)
+
+    start_time = time.perf_counter()
+    stats = indexer.sync(n_workers=args.workers, progress_callback=show_progress)
+    elapsed = time.perf_counter() - start_time
+
+    for path, error in sorted(stats['errors'].items()):
+        print(f"Skipping {path}: {error}", file=sys.stderr)
+    print(f"Scanned {stats['scanned']} files in {elapsed:.1f}s: "
+          f"{stats['added']} added, {stats['updated']} updated, "
+          f"{stats['removed']} removed, {stats['unchanged']} unchanged, "
+          f"{stats['failed']} failed")
+    print(f"Store {args.store} holds {store.num_live} live resumes")
+
+
+if __name__ == "__main__":
+    main()
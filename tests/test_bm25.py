@@ -0,0 +1,42 @@
+import numpy as np
+from utils.bm25 import BM25Index
+from utils.embedding_service import EmbeddingService
+from utils.similarity_calculator import SimilarityCalculator
+
+JOB = ("Senior Python developer to build Django REST APIs and data pipelines. "
+       "Requires Python, Django, PostgreSQL, SQL, Docker, AWS and unit testing.")
+NURSE = ("Registered nurse with eight years of intensive care experience. "
+         "Patient assessment, medication administration, wound care and "
+         "charting in Epic; ran weekly SQL reports of ward occupancy.")
+DEVELOPER = ("Python developer building Django REST APIs on AWS with Docker, "
+             "PostgreSQL and SQL data pipelines, covered by unit testing.")
+
+
+def hybrid_scores(resumes: list, bm25_weight: float = 0.5) -> list:
+    """Score resumes the way the app does with a request-scoped model"""
+    scoped = EmbeddingService(sparse_output=True).fit_scoped(resumes + [JOB])
+    calculator = SimilarityCalculator()
+    cosine = calculator.calculate_similarities(
+        scoped.generate_embedding(JOB), scoped.generate_embeddings_batch(resumes))
+    index = BM25Index().fit(resumes)
+    return calculator.calculate_hybrid_similarities(
+        cosine, index.score(JOB), index.max_score(JOB), bm25_weight=bm25_weight)
+
+
+def test_max_score_bounds_every_document():
+    resumes = [NURSE, DEVELOPER, DEVELOPER + " " + DEVELOPER, JOB]
+    index = BM25Index().fit(resumes)
+
+    for query in (JOB, NURSE, "python python sql", "cobol"):
+        assert np.all(index.score(query) <= index.max_score(query))
+    assert index.max_score("") == 0
+
+
+def test_weak_resume_stays_weak_in_its_own_pool():
+    alone = hybrid_scores([NURSE])[0]
+
+    # Dividing by the pool's best BM25 score used to lift this to "Moderate Match"
+    assert SimilarityCalculator.get_similarity_category(alone) == "Poor Match"
+    with_developer = hybrid_scores([NURSE, DEVELOPER])
+    assert with_developer[0] < 0.3
+    assert with_developer[1] > 4 * with_developer[0]
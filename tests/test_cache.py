@@ -0,0 +1,57 @@
+import os
+import numpy as np
+from utils.cache import LRUCache
+from utils.embedding_service import EmbeddingService
+
+
+def disk_usage(directory) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(directory) for name in names
+    )
+
+
+def test_disk_tier_stays_under_max_disk_bytes(tmp_path):
+    cache = LRUCache(max_entries=1, disk_dir=str(tmp_path), max_disk_bytes=50_000)
+    payload = np.zeros(1000)  # ~8 KB pickled
+
+    keys = [LRUCache.make_key(str(i)) for i in range(40)]
+    for key in keys:
+        cache.put(key, payload)
+
+    assert disk_usage(tmp_path) <= 50_000
+    assert cache.get_stats()['disk_evictions'] > 0
+    # The newest entries survive eviction
+    assert cache.get(keys[-1]) is not None
+    assert cache._read_disk(keys[0]) is None
+
+
+def test_disk_hits_refresh_recency(tmp_path):
+    cache = LRUCache(max_entries=1, disk_dir=str(tmp_path), max_disk_bytes=50_000)
+    payload = np.zeros(1000)
+
+    first = LRUCache.make_key('first')
+    cache.put(first, payload)
+    os.utime(cache._disk_path(first), (0, 0))
+    for i in range(5):
+        cache.put(LRUCache.make_key(str(i)), payload)
+        # Read the first entry back from disk so it counts as recently used
+        cache.clear()
+        assert cache.get(first) is not None
+
+    for i in range(5, 40):
+        cache.put(LRUCache.make_key(str(i)), payload)
+        cache.clear()
+        assert cache.get(first) is not None
+
+
+def test_scoped_models_do_not_use_the_shared_cache():
+    cache = LRUCache()
+    service = EmbeddingService(sparse_output=True, cache=cache)
+
+    scoped = service.fit_scoped(["python developer", "java engineer"])
+    scoped.generate_embeddings_batch(["python developer"])
+
+    assert scoped.cache is None
+    assert service.cache is cache
+    assert cache.get_stats()['entries'] == 0
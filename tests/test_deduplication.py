@@ -0,0 +1,76 @@
+import random
+import numpy as np
+from utils.deduplication import NearDuplicateDetector
+
+WORDS = [
+    "python", "java", "sql", "aws", "docker", "kubernetes", "react", "spark",
+    "nurse", "sales", "finance", "excel", "tableau", "agile", "terraform",
+    "pandas", "marketing", "forecasting", "mentored", "pipeline", "led", "built",
+    "designed", "team", "platform", "data", "customers", "reduced", "costs", "scaled",
+]
+
+
+def make_resume(seed: int, length: int = 300) -> list:
+    rng = random.Random(seed)
+    return [rng.choice(WORDS) for _ in range(length)]
+
+
+def edit(words: list, seed: int, count: int) -> list:
+    """Replace count words at random positions with a new word each"""
+    rng = random.Random(seed)
+    edited = list(words)
+    for position in rng.sample(range(len(edited)), count):
+        edited[position] = f"edit{seed}x{position}"
+    return edited
+
+
+def shingle_jaccard(detector: NearDuplicateDetector, first: str, second: str) -> float:
+    first = set(detector._shingle_hashes(first).tolist())
+    second = set(detector._shingle_hashes(second).tolist())
+    return len(first & second) / len(first | second)
+
+
+def test_edit_chain_does_not_collapse_into_one_cluster():
+    detector = NearDuplicateDetector()
+    # Each copy edits the previous one, so neighbours stay close while the
+    # last copy drifts well below the threshold from the first
+    versions = [make_resume(0)]
+    for step in range(1, 7):
+        versions.append(edit(versions[-1], seed=step, count=4))
+    texts = [' '.join(words) for words in versions]
+
+    for older, newer in zip(texts, texts[1:]):
+        assert shingle_jaccard(detector, older, newer) > 0.85
+    assert shingle_jaccard(detector, texts[0], texts[-1]) < detector.threshold
+
+    representatives = detector.find_clusters(texts)
+    signatures = [detector.signature(text) for text in texts]
+
+    assert representatives[1] == 0
+    assert representatives[-1] != 0
+    for index, representative in enumerate(representatives):
+        assert representative <= index
+        assert np.mean(signatures[index] == signatures[representative]) >= detector.threshold
+
+
+def test_near_duplicates_share_the_lowest_index_representative():
+    original = make_resume(1)
+    texts = [
+        ' '.join(make_resume(2)),
+        ' '.join(original),
+        ' '.join(make_resume(3)),
+        ' '.join(edit(original, seed=9, count=2)),
+        ' '.join(original).upper(),
+    ]
+
+    representatives = NearDuplicateDetector().find_clusters(texts)
+
+    np.testing.assert_array_equal(representatives, [0, 1, 2, 1, 1])
+
+
+def test_distinct_and_empty_texts_stay_singletons():
+    texts = [' '.join(make_resume(seed)) for seed in range(5)] + ["", "  ", "---"]
+
+    representatives = NearDuplicateDetector().find_clusters(texts)
+
+    np.testing.assert_array_equal(representatives, np.arange(len(texts)))
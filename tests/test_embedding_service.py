@@ -0,0 +1,45 @@
+import unicodedata
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from utils.embedding_service import EmbeddingService
+
+TEXTS = [
+    "Résumé of José Núñez — Senior Data Engineer, Zürich",
+    "Naïve Bayes, façade patterns and coöperation at Café Résumé Ltd",
+    "Plain ASCII resume: Python, SQL and AWS",
+]
+
+
+@pytest.mark.parametrize('form', ['NFC', 'NFD'])
+@pytest.mark.parametrize('text', TEXTS)
+def test_preprocess_tokens_matches_tfidf_tokenizer(text, form):
+    """Tokens equal those of TfidfVectorizer(strip_accents='unicode') in either form"""
+    text = unicodedata.normalize(form, text)
+    reference = TfidfVectorizer(strip_accents='unicode').build_analyzer()
+
+    assert EmbeddingService()._preprocess_tokens(text, max_tokens=None) == reference(text)
+
+
+def test_decomposed_accents_do_not_split_words():
+    text = unicodedata.normalize('NFD', "Résumé of José Núñez")
+
+    assert EmbeddingService()._preprocess_tokens(text) == ['resume', 'of', 'jose', 'nunez']
+
+
+def test_get_embedding_dimension_fits_on_tokens():
+    service = EmbeddingService()
+
+    assert service.get_embedding_dimension() == 3
+    assert set(service.vectorizer.get_feature_names_out()) == {'test', 'text', 'test text'}
+
+
+def test_fit_scoped_max_tokens_covers_later_chunks():
+    # The only mention of kubernetes is past the default 512-token window
+    resume = ' '.join(['python'] * 600 + ['kubernetes'])
+
+    truncated = EmbeddingService(sparse_output=True).fit_scoped([resume])
+    assert 'kubernetes' not in truncated.vectorizer.vocabulary_
+
+    full = EmbeddingService(sparse_output=True).fit_scoped([resume], max_tokens=256 * 8)
+    chunks, _ = full.generate_chunk_embeddings([resume], chunk_size=256, max_chunks=8)
+    assert chunks[:, full.vectorizer.vocabulary_['kubernetes']].nnz == 1
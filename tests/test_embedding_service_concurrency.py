@@ -0,0 +1,83 @@
+import random
+import threading
+import numpy as np
+import pytest
+from utils.embedding_service import EmbeddingService, IncrementalEmbeddingService
+from utils.similarity_calculator import SimilarityCalculator
+
+NUM_THREADS = 16
+
+WORDS = [
+    "python", "java", "sql", "aws", "docker", "kubernetes", "react", "spark",
+    "nurse", "sales", "finance", "excel", "tableau", "agile", "terraform",
+    "pandas", "marketing", "forecasting", "mentored", "pipeline", "café"
+]
+
+
+def make_pool(seed: int, size: int = 12) -> tuple:
+    """A job description and its own pool of synthetic resumes"""
+    rng = random.Random(seed)
+    job = ' '.join(rng.choice(WORDS) for _ in range(40))
+    resumes = [' '.join(rng.choice(WORDS) for _ in range(120)) for _ in range(size)]
+    return job, resumes
+
+
+def score_pool(service: EmbeddingService, job: str, resumes: list) -> np.ndarray:
+    """Fit a request-scoped model on the pool and score it, as the app does"""
+    scoped = service.fit_scoped(resumes + [job])
+    job_embedding = scoped.generate_embedding(job)
+    resume_embeddings = scoped.generate_embeddings_batch(resumes)
+    return np.asarray(
+        SimilarityCalculator().calculate_similarities(job_embedding, resume_embeddings)
+    )
+
+
+def test_concurrent_fit_scoped_matches_serial_run():
+    shared = EmbeddingService(sparse_output=True)
+    pools = [make_pool(seed) for seed in range(NUM_THREADS)]
+    expected = [score_pool(shared, job, resumes) for job, resumes in pools]
+
+    barrier = threading.Barrier(NUM_THREADS)
+    results = [None] * NUM_THREADS
+    errors = []
+
+    def worker(index: int):
+        try:
+            # Release every thread at once to maximize interleaving
+            barrier.wait()
+            results[index] = score_pool(shared, *pools[index])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(NUM_THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    for index in range(NUM_THREADS):
+        np.testing.assert_array_equal(results[index], expected[index])
+
+    # The shared service was only copied, never fitted
+    assert not shared.is_fitted
+    assert shared.fingerprint is None
+    assert not hasattr(shared.vectorizer, 'vocabulary_')
+
+
+def test_frozen_service_rejects_mutation(tmp_path):
+    job, resumes = make_pool(0)
+    frozen = EmbeddingService().fit_scoped(resumes)
+    fingerprint = frozen.fingerprint
+
+    with pytest.raises(RuntimeError):
+        frozen.fit_vectorizer([job])
+    with pytest.raises(RuntimeError):
+        frozen.load_vectorizer(str(tmp_path / 'model.joblib'))
+    assert frozen.fingerprint == fingerprint
+
+    incremental = IncrementalEmbeddingService()
+    incremental.add_documents(resumes)
+    incremental.freeze()
+    with pytest.raises(RuntimeError):
+        incremental.add_documents([job])
@@ -0,0 +1,142 @@
+import json
+import os
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from utils.embedding_store import (DATA_FILE, DELETED_FILE, DENSE_FILE, IDS_FILE,
+                                   INDICES_FILE, INDPTR_FILE, EmbeddingStore)
+from utils.similarity_calculator import SimilarityCalculator
+
+
+def make_embeddings(seed: int, num_rows: int, layout: str, dimension: int = 64):
+    rng = np.random.default_rng(seed)
+    matrix = sparse.random(num_rows, dimension, density=0.2, format='csr',
+                           random_state=rng, dtype=np.float64)
+    return matrix if layout == 'sparse' else matrix.toarray()
+
+
+def expected_top_k(job, rows, top_k: int, live=None) -> tuple:
+    """Reference ranking from calculate_similarities over the same rows"""
+    scores = np.asarray(SimilarityCalculator().calculate_similarities(job, rows))
+    if live is not None:
+        scores[~live] = -np.inf
+    return SimilarityCalculator.get_top_k(scores, top_k)
+
+
+@pytest.mark.parametrize('layout', ['sparse', 'dense'])
+def test_appends_are_searchable(tmp_path, layout):
+    store = EmbeddingStore(str(tmp_path / 'store'))
+    first = make_embeddings(0, 30, layout)
+    second = make_embeddings(1, 20, layout)
+
+    np.testing.assert_array_equal(store.append(first), np.arange(30))
+    np.testing.assert_array_equal(
+        store.append(second, row_ids=[f"cv{i}" for i in range(20)]), np.arange(30, 50))
+
+    stack = sparse.vstack if layout == 'sparse' else np.vstack
+    rows = stack([first, second])
+    job = make_embeddings(2, 1, layout)
+    if layout == 'dense':
+        job = job[0]
+    expected_rows, expected_scores = expected_top_k(job, rows, 10)
+    results = store.search(job, top_k=10)
+
+    assert [row for _, row, _ in results] == expected_rows.tolist()
+    np.testing.assert_allclose([score for _, _, score in results], expected_scores,
+                               atol=1e-6)
+    assert results[0][0] == store.row_ids[results[0][1]]
+    assert store.row_ids[:2] == ['0', '1'] and store.row_ids[30] == 'cv0'
+    assert store.get_store_info()['layout'] == layout
+
+
+def test_deleted_rows_are_hidden(tmp_path):
+    store = EmbeddingStore(str(tmp_path / 'store'))
+    rows = make_embeddings(0, 40, 'sparse')
+    store.append(rows, row_ids=[f"cv{i}" for i in range(40)])
+    job = make_embeddings(1, 1, 'sparse')
+    best = [row for _, row, _ in store.search(job, top_k=5)]
+
+    assert store.delete(best[:2]) == 2
+    assert store.delete(best[:1]) == 0
+    assert store.delete_ids([f"cv{best[2]}"]) == 1
+
+    live = store.live_mask()
+    assert store.num_live == 37 and len(store) == 40
+    results = store.search(job, top_k=40)
+    expected_rows, _ = expected_top_k(job, rows, 37, live=live)
+    assert [row for _, row, _ in results] == expected_rows.tolist()
+    assert not set(best[:3]) & {row for _, row, _ in results}
+
+
+def test_second_instance_sees_appends_after_refresh(tmp_path):
+    path = str(tmp_path / 'store')
+    writer = EmbeddingStore(path)
+    writer.append(make_embeddings(0, 10, 'dense'))
+    reader = EmbeddingStore(path)
+
+    writer.append(make_embeddings(1, 5, 'dense'), row_ids=[f"new{i}" for i in range(5)])
+    assert len(reader) == 10
+
+    reader.refresh()
+    assert len(reader) == 15
+    assert reader.row_ids[10:] == [f"new{i}" for i in range(5)]
+    np.testing.assert_array_equal(reader.get_embeddings(), writer.get_embeddings())
+
+    # Tombstones are shared through the memory map without a refresh
+    writer.delete([3])
+    assert not reader.live_mask()[3]
+
+
+def test_uncommitted_bytes_are_ignored_then_truncated(tmp_path):
+    path = str(tmp_path / 'store')
+    store = EmbeddingStore(path)
+    rows = make_embeddings(0, 10, 'sparse')
+    store.append(rows)
+    files = (DATA_FILE, INDICES_FILE, INDPTR_FILE, DELETED_FILE)
+    committed = {name: os.path.getsize(os.path.join(path, name)) for name in files}
+
+    # An append that crashed before writing meta.json
+    for name in files:
+        with open(os.path.join(path, name), 'ab') as store_file:
+            store_file.write(b'\xff' * 24)
+    with open(os.path.join(path, IDS_FILE), 'a', encoding='utf-8') as ids_file:
+        ids_file.write(json.dumps("crashed") + '\n')
+
+    reopened = EmbeddingStore(path)
+    assert len(reopened) == 10 and 'crashed' not in reopened.row_ids
+    np.testing.assert_array_equal(reopened.get_embeddings().toarray(),
+                                  store.get_embeddings().toarray())
+
+    more = make_embeddings(1, 4, 'sparse')
+    reopened.append(more, row_ids=['a', 'b', 'c', 'd'])
+    grown = {name: os.path.getsize(os.path.join(path, name)) - committed[name]
+             for name in files}
+    assert grown == {DATA_FILE: more.nnz * 4, INDICES_FILE: more.nnz * 4,
+                     INDPTR_FILE: 4 * 8, DELETED_FILE: 4}
+    assert reopened.row_ids == [str(i) for i in range(10)] + ['a', 'b', 'c', 'd']
+    np.testing.assert_allclose(reopened.get_embeddings()[10:].toarray(),
+                               normalize(more).toarray(), atol=1e-6)
+    assert reopened.live_mask().all()
+
+
+def test_fingerprint_mismatch_raises(tmp_path):
+    path = str(tmp_path / 'store')
+    EmbeddingStore(path, fingerprint='model-a').append(make_embeddings(0, 3, 'dense'))
+
+    assert EmbeddingStore(path).fingerprint == 'model-a'
+    assert len(EmbeddingStore(path, fingerprint='model-a')) == 3
+    with pytest.raises(ValueError, match='model-a'):
+        EmbeddingStore(path, fingerprint='model-b')
+
+
+def test_layout_and_dimension_are_fixed_by_the_first_append(tmp_path):
+    store = EmbeddingStore(str(tmp_path / 'store'))
+    store.append(make_embeddings(0, 3, 'dense'))
+
+    with pytest.raises(ValueError):
+        store.append(make_embeddings(1, 3, 'sparse'))
+    with pytest.raises(ValueError):
+        store.append(make_embeddings(1, 3, 'dense', dimension=32))
+    assert len(store) == 3
+    assert os.path.getsize(os.path.join(store.path, DENSE_FILE)) == 3 * 64 * 4
@@ -0,0 +1,135 @@
+import gzip
+import io
+import tarfile
+import zipfile
+import pytest
+import utils.file_processor as file_processor_module
+from utils.cache import LRUCache
+from utils.file_processor import PARALLEL_MIN_FILES, FileProcessor, _NamedBytesIO
+
+
+def make_uploads(count: int) -> list:
+    uploads = [
+        _NamedBytesIO(f"cv{i}.txt", f"resume {i}: python sql".encode()) for i in range(count)
+    ]
+    uploads.append(_NamedBytesIO("broken.pdf", b"%PDF-1.4 not really a pdf"))
+    uploads.append(_NamedBytesIO("notes.csv", b"a,b"))
+    return uploads
+
+
+def test_parallel_results_keep_input_order():
+    uploads = make_uploads(PARALLEL_MIN_FILES + 2)
+    results = FileProcessor().process_files_parallel(uploads, n_workers=2)
+
+    assert [result['name'] for result in results] == [upload.name for upload in uploads]
+    for i, result in enumerate(results[:-2]):
+        assert result['content'] == f"resume {i}: python sql"
+        assert result['error'] is None
+    assert results[-2]['content'] is None
+    assert results[-2]['error'].startswith("Failed to process file broken.pdf: ")
+    assert "Unsupported file format: csv" in results[-1]['error']
+
+
+def test_failures_are_cached_and_no_pool_starts_on_rerun(monkeypatch):
+    processor = FileProcessor(cache=LRUCache())
+    uploads = make_uploads(PARALLEL_MIN_FILES + 2)
+    first = processor.process_files_parallel(uploads, n_workers=2)
+
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a process pool was started for cached files")
+
+    monkeypatch.setattr(file_processor_module, 'ProcessPoolExecutor', no_pool)
+    second = processor.process_files_parallel(uploads, n_workers=2)
+
+    assert second == first
+    assert processor.cache.get_stats()['misses'] == len(uploads) - 1
+
+
+def test_small_batches_stay_in_process(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("a process pool was started for a small batch")
+
+    monkeypatch.setattr(file_processor_module, 'ProcessPoolExecutor', no_pool)
+    results = FileProcessor().process_files_parallel(
+        make_uploads(PARALLEL_MIN_FILES - 3), n_workers=4)
+
+    assert all(result['name'] for result in results)
+
+
+def test_process_file_caches_failures():
+    processor = FileProcessor(cache=LRUCache())
+    broken = _NamedBytesIO("broken.pdf", b"%PDF-1.4 not really a pdf")
+
+    with pytest.raises(Exception) as first:
+        processor.process_file(broken)
+    with pytest.raises(Exception) as second:
+        processor.process_file(_NamedBytesIO("renamed.pdf", broken.getvalue()))
+
+    assert str(second.value) == str(first.value).replace("broken.pdf", "renamed.pdf")
+    assert processor.cache.get_stats()['memory_hits'] == 1
+
+
+def make_zip(members: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+def make_tar(members: dict, mode: str) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=mode) as archive:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+
+RESUMES = {f"export/cv{i}.txt": f"resume {i}: python sql".encode() for i in range(12)}
+
+
+@pytest.mark.parametrize('name, data', [
+    ('export.zip', make_zip({**RESUMES, '__MACOSX/._cv0.txt': b'x', 'notes.csv': b'a'})),
+    ('export.tar', make_tar(RESUMES, 'w')),
+    ('export.tar.gz', make_tar(RESUMES, 'w:gz')),
+    ('export.tar.bz2', make_tar(RESUMES, 'w:bz2')),
+    ('export.tar.xz', make_tar(RESUMES, 'w:xz')),
+])
+def test_archives_expand_in_place(name, data):
+    uploads = [_NamedBytesIO("first.txt", b"first resume"),
+               _NamedBytesIO(name, data),
+               _NamedBytesIO("last.txt", b"last resume")]
+    results = FileProcessor().process_files_parallel(uploads, n_workers=2)
+
+    assert [result['name'] for result in results] == (
+        ["first.txt"] + [f"{name}/{member}" for member in RESUMES] + ["last.txt"]
+    )
+    assert all(result['error'] is None for result in results)
+    assert results[1]['content'] == "resume 0: python sql"
+
+
+def test_archive_caps_stop_reading():
+    data = make_zip(RESUMES)
+
+    by_count = FileProcessor(archive_max_members=3).process_files_parallel(
+        [_NamedBytesIO("export.zip", data)])
+    assert [result['error'] is None for result in by_count] == [True] * 3 + [False]
+    assert "more than 3 files" in by_count[-1]['error']
+
+    bomb = make_zip({"big.txt": b"a" * (4 * 1024 * 1024)})
+    by_size = FileProcessor(archive_max_bytes=1024 * 1024).process_files_parallel(
+        [_NamedBytesIO("bomb.zip", bomb)])
+    assert len(by_size) == 1
+    assert "decompress to more than" in by_size[0]['error']
+
+
+def test_unreadable_and_non_archive_gz_files_fail_cleanly():
+    results = FileProcessor().process_files_parallel([
+        _NamedBytesIO("broken.zip", b"not a zip"),
+        _NamedBytesIO("resume.gz", gzip.compress(b"resume")),
+    ])
+
+    assert results[0]['error'].startswith("Failed to read archive broken.zip")
+    assert "Unsupported file format: gz" in results[1]['error']
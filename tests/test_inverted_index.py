@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from utils.inverted_index import InvertedIndex
+from utils.similarity_calculator import SimilarityCalculator
+
+TOP_KS = [1, 3, 10, 50, 500]
+
+
+def make_pool(seed: int, num_docs: int = 400, num_terms: int = 300) -> tuple:
+    """
+    Random non-negative TF-IDF rows with duplicates, empty rows and a query
+
+    A fifth of the rows are exact copies of other rows, so their scores tie
+    bit for bit, and a few rows are empty, so some documents score 0.
+    """
+    rng = np.random.default_rng(seed)
+    pool = sparse.random(num_docs, num_terms, density=0.03, format='csr',
+                         random_state=rng, dtype=np.float64)
+    copies = rng.choice(num_docs, size=num_docs // 5, replace=False)
+    pool = sparse.vstack([pool, pool[copies], sparse.csr_matrix((5, num_terms))],
+                         format='csr')
+    pool = pool[rng.permutation(pool.shape[0])]
+    pool = normalize(pool, norm='l2')
+
+    query = sparse.random(1, num_terms, density=0.1, format='csr',
+                          random_state=rng, dtype=np.float64)
+    return pool, query
+
+
+def brute_force_top_k(pool: sparse.csr_matrix, query, top_k: int) -> tuple:
+    """
+    Reference top-k by scoring every document
+
+    Zero-score rule: InvertedIndex only reads the postings of query terms,
+    so documents sharing no term with the query (score 0) are never
+    returned. The reference therefore drops zero scores from the
+    brute-force top k, and returns fewer than k documents when fewer than
+    k score above 0.
+    """
+    calculator = SimilarityCalculator()
+    scores = np.asarray(calculator.calculate_similarities(query, pool))
+    indices, top_scores = calculator.get_top_k(scores, top_k)
+    positive = top_scores > 0
+    return indices[positive], top_scores[positive]
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('top_k', TOP_KS)
+def test_search_matches_brute_force(seed, top_k):
+    pool, query = make_pool(seed)
+    index = InvertedIndex(pool)
+
+    indices, scores, _ = index.search(query, top_k=top_k)
+    expected_indices, expected_scores = brute_force_top_k(pool, query, top_k)
+
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(scores, expected_scores, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('top_k', TOP_KS)
+def test_search_breaks_ties_by_lower_index(top_k):
+    pool, _ = make_pool(0)
+    # A query equal to a duplicated row ties that row and its copies at 1.0
+    counts = {}
+    for row in range(pool.shape[0]):
+        key = pool[row].toarray().tobytes()
+        counts.setdefault(key, []).append(row)
+    duplicated = next(rows for rows in counts.values() if len(rows) > 1)
+    query = pool[duplicated[0]]
+
+    indices, scores, _ = InvertedIndex(pool).search(query, top_k=top_k)
+    expected_indices, expected_scores = brute_force_top_k(pool, query, top_k)
+
+    np.testing.assert_array_equal(indices, expected_indices)
+    np.testing.assert_allclose(scores, expected_scores, rtol=0, atol=1e-12)
+    np.testing.assert_array_equal(indices[:len(duplicated)], duplicated[:top_k])
+
+
+def test_search_skips_documents_without_shared_terms():
+    pool, query = make_pool(1)
+    indices, scores, _ = InvertedIndex(pool).search(query, top_k=pool.shape[0])
+
+    shares_terms = np.asarray((pool @ query.T).todense()).ravel() > 0
+    assert len(indices) == shares_terms.sum()
+    assert np.all(scores > 0)
+
+
+THRESHOLDS = [0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9]
+
+
+@pytest.mark.parametrize('seed', range(10))
+@pytest.mark.parametrize('threshold', THRESHOLDS)
+def test_search_threshold_matches_brute_force(seed, threshold):
+    pool, query = make_pool(seed)
+    # Mix in a pool row so every cutoff has matches, including exact ties
+    query = normalize(query + pool[seed], norm='l2')
+
+    indices, scores, _ = InvertedIndex(pool).search_threshold(query, threshold=threshold)
+
+    all_scores = np.asarray(SimilarityCalculator().calculate_similarities(query, pool))
+    expected_indices = np.flatnonzero(all_scores >= threshold - 1e-9)
+    order = np.lexsort((expected_indices, -all_scores[expected_indices]))
+
+    np.testing.assert_array_equal(indices, expected_indices[order])
+    np.testing.assert_allclose(scores, all_scores[expected_indices[order]],
+                               rtol=0, atol=1e-12)
+
+
+def test_search_threshold_keeps_scores_at_the_cutoff():
+    pool, _ = make_pool(0)
+    index = InvertedIndex(pool)
+    # A row whose score against itself rounds to just below 1.0
+    row = next(row for row in range(pool.shape[0])
+               if pool[row].nnz and index.search(pool[row], top_k=1)[1][0] < 1.0)
+
+    indices, scores, _ = index.search_threshold(pool[row], threshold=1.0)
+
+    assert row in indices
+    np.testing.assert_allclose(scores, 1.0, rtol=0, atol=1e-9)
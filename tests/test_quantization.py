@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from utils.quantization import SUPPORTED_PRECISIONS, QuantizedEmbeddings
+
+
+def make_embeddings(seed: int = 0) -> sparse.csr_matrix:
+    rng = np.random.default_rng(seed)
+    matrix = sparse.random(1000, 300, density=0.05, format='csr',
+                           random_state=rng, dtype=np.float32)
+    # Empty rows must score 0 and keep the block offsets aligned
+    keep = np.ones(matrix.shape[0], dtype=np.float32)
+    keep[::97] = 0
+    matrix = sparse.csr_matrix(sparse.diags(keep) @ matrix)
+    matrix.eliminate_zeros()
+    return matrix
+
+
+@pytest.mark.parametrize('precision', SUPPORTED_PRECISIONS)
+@pytest.mark.parametrize('block_size', [1, 7, 128, 5000])
+def test_sparse_blockwise_dot_matches_full_dequantization(precision, block_size):
+    embeddings = make_embeddings()
+    query = np.random.default_rng(1).random(300)
+    quantized = QuantizedEmbeddings(embeddings, precision=precision,
+                                    block_size=block_size)
+
+    # Reference: dequantize every stored value at once
+    dequantized = sparse.csr_matrix(
+        (quantized.values.astype(np.float32), quantized.indices, quantized.indptr),
+        shape=quantized.shape
+    )
+    query = np.asarray(query, dtype=np.float32)
+    expected = (dequantized @ (query / np.linalg.norm(query))) * quantized.scales
+
+    scores = quantized.dot(query)
+    np.testing.assert_array_equal(scores, expected)
+    assert np.all(scores[::97] == 0)
+
+
+@pytest.mark.parametrize('precision', SUPPORTED_PRECISIONS)
+def test_sparse_and_dense_scores_agree(precision):
+    embeddings = make_embeddings()
+    query = np.random.default_rng(2).random(300)
+
+    sparse_scores = QuantizedEmbeddings(embeddings, precision, block_size=64).dot(query)
+    dense_scores = QuantizedEmbeddings(
+        embeddings.toarray(), precision, block_size=64).dot(query)
+
+    # Normalization can round a value to a neighbouring float16 step
+    np.testing.assert_allclose(sparse_scores, dense_scores, rtol=0, atol=1e-4)
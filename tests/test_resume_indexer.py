@@ -0,0 +1,142 @@
+import os
+import numpy as np
+import pytest
+from utils.embedding_service import EmbeddingService
+from utils.embedding_store import EmbeddingStore
+from utils.resume_indexer import MANIFEST_FILE, ResumeIndexer
+
+RESUMES = {
+    'alice.txt': "Python developer, Django and PostgreSQL, AWS pipelines",
+    'bob.txt': "Registered nurse, intensive care, patient assessment",
+    'team/carol.txt': "Data engineer, Spark, Airflow and SQL warehouses",
+}
+
+
+def write(directory, relative_path: str, content, mtime_ns: int = None):
+    path = directory / relative_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content, encoding='utf-8')
+    if mtime_ns is not None:
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+@pytest.fixture
+def service():
+    return EmbeddingService(sparse_output=True).fit_scoped(
+        list(RESUMES.values()) + ["Nurse with Python, Spark and SQL reporting"])
+
+
+@pytest.fixture
+def resume_dir(tmp_path):
+    directory = tmp_path / 'resumes'
+    for relative_path, content in RESUMES.items():
+        write(directory, relative_path, content)
+    return directory
+
+
+def make_indexer(resume_dir, tmp_path, service, extracted=None) -> ResumeIndexer:
+    """Indexer over a shared store; extracted collects the names sent to extraction"""
+    indexer = ResumeIndexer(str(resume_dir), EmbeddingStore(str(tmp_path / 'store')),
+                            service, batch_size=2)
+    if extracted is not None:
+        process_files_parallel = indexer.file_processor.process_files_parallel
+
+        def recording(files, **kwargs):
+            extracted.extend(file.name for file in files)
+            return process_files_parallel(files, **kwargs)
+
+        indexer.file_processor.process_files_parallel = recording
+    return indexer
+
+
+def live_rows(store: EmbeddingStore, relative_path: str) -> list:
+    live = store.live_mask()
+    return [row for row, row_id in enumerate(store.row_ids)
+            if row_id == relative_path and live[row]]
+
+
+def test_initial_sync_indexes_every_file(resume_dir, tmp_path, service):
+    indexer = make_indexer(resume_dir, tmp_path, service)
+    progress = []
+    stats = indexer.sync(n_workers=1,
+                         progress_callback=lambda *args: progress.append(args))
+
+    assert stats == {'scanned': 3, 'unchanged': 0, 'added': 3, 'updated': 0,
+                     'removed': 0, 'failed': 0, 'errors': {}}
+    assert progress == [(2, 3), (3, 3)]
+    assert sorted(indexer.store.row_ids) == sorted(RESUMES)
+    assert indexer.store.num_live == 3
+    assert os.path.exists(tmp_path / 'store' / MANIFEST_FILE)
+
+    job = service.generate_embedding("Python developer with Django")
+    assert indexer.store.search(job, top_k=1)[0][0] == 'alice.txt'
+
+
+def test_changes_are_mirrored_incrementally(resume_dir, tmp_path, service):
+    make_indexer(resume_dir, tmp_path, service).sync(n_workers=1)
+    old_row = live_rows(EmbeddingStore(str(tmp_path / 'store')), 'alice.txt')[0]
+
+    write(resume_dir, 'alice.txt', "Python developer, FastAPI and Kubernetes")
+    os.remove(resume_dir / 'bob.txt')
+    # Touched without changing its content
+    carol = resume_dir / 'team' / 'carol.txt'
+    write(resume_dir, 'team/carol.txt', carol.read_text(encoding='utf-8'),
+          mtime_ns=carol.stat().st_mtime_ns + 10 ** 9)
+    write(resume_dir, 'dave.txt', "Sales manager, CRM and forecasting")
+
+    extracted = []
+    indexer = make_indexer(resume_dir, tmp_path, service, extracted)
+    stats = indexer.sync(n_workers=1)
+
+    assert stats == {'scanned': 3, 'unchanged': 1, 'added': 1, 'updated': 1,
+                     'removed': 1, 'failed': 0, 'errors': {}}
+    assert sorted(extracted) == ['alice.txt', 'dave.txt']
+
+    store = indexer.store
+    new_rows = live_rows(store, 'alice.txt')
+    assert len(new_rows) == 1 and new_rows[0] != old_row
+    assert not store.live_mask()[old_row]
+    assert live_rows(store, 'bob.txt') == []
+    assert len(live_rows(store, 'team/carol.txt')) == 1
+    assert 'bob.txt' not in indexer.manifest
+    assert indexer.manifest['team/carol.txt']['mtime_ns'] == carol.stat().st_mtime_ns
+
+
+def test_unreadable_files_are_recorded_and_retried_only_when_changed(
+        resume_dir, tmp_path, service):
+    write(resume_dir, 'empty.txt', "")
+    write(resume_dir, 'broken.pdf', b"%PDF-1.4 not really a pdf")
+
+    stats = make_indexer(resume_dir, tmp_path, service).sync(n_workers=1)
+    assert stats['added'] == 3 and stats['failed'] == 2
+    assert sorted(stats['errors']) == ['broken.pdf', 'empty.txt']
+
+    extracted = []
+    rerun = make_indexer(resume_dir, tmp_path, service, extracted).sync(n_workers=1)
+    assert extracted == []
+    assert rerun['unchanged'] == 5 and rerun['failed'] == 0
+    assert make_indexer(resume_dir, tmp_path, service).manifest['empty.txt']['error']
+
+    write(resume_dir, 'empty.txt', "Now a real resume: Java and Spring")
+    extracted = []
+    fixed = make_indexer(resume_dir, tmp_path, service, extracted).sync(n_workers=1)
+    assert extracted == ['empty.txt']
+    assert fixed['added'] == 1 and fixed['failed'] == 0
+
+
+def test_noop_rerun_reports_everything_unchanged(resume_dir, tmp_path, service):
+    make_indexer(resume_dir, tmp_path, service).sync(n_workers=1)
+    rows_before = len(EmbeddingStore(str(tmp_path / 'store')))
+
+    extracted = []
+    indexer = make_indexer(resume_dir, tmp_path, service, extracted)
+    stats = indexer.sync(n_workers=1)
+
+    assert stats == {'scanned': 3, 'unchanged': 3, 'added': 0, 'updated': 0,
+                     'removed': 0, 'failed': 0, 'errors': {}}
+    assert extracted == []
+    assert len(indexer.store) == rows_before
+    np.testing.assert_array_equal(indexer.store.live_mask(), True)
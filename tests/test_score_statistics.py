@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from utils.score_statistics import StreamingStatistics
+
+DISTRIBUTIONS = {
+    'uniform': lambda rng, size: rng.random(size),
+    'beta': lambda rng, size: rng.beta(2, 8, size),
+}
+
+
+def feed(scores: np.ndarray, block_size: int) -> StreamingStatistics:
+    statistics = StreamingStatistics()
+    for start in range(0, len(scores), block_size):
+        statistics.update(scores[start:start + block_size])
+    return statistics
+
+
+@pytest.mark.parametrize('distribution', sorted(DISTRIBUTIONS))
+@pytest.mark.parametrize('block_size', [512, 4096, 65536])
+def test_quantiles_match_numpy_for_any_block_size(distribution, block_size):
+    # 4096 is the default block size of the chunked and batch scorers
+    scores = DISTRIBUTIONS[distribution](np.random.default_rng(0), 1_000_000)
+    statistics = feed(scores, block_size)
+
+    for q in (0.5, 0.9):
+        assert abs(statistics.quantile(q) - np.quantile(scores, q)) < 5e-4
+    assert len(statistics._centroid_means) < statistics.compression
+
+
+def test_moments_and_counts_are_exact():
+    scores = np.random.default_rng(1).random(50_000)
+    summary = feed(scores, 4096).get_statistics()
+
+    assert summary['count'] == len(scores)
+    assert summary['mean'] == pytest.approx(scores.mean(), abs=1e-12)
+    assert summary['std'] == pytest.approx(scores.std(), abs=1e-12)
+    assert summary['min'] == scores.min() and summary['max'] == scores.max()
+    assert summary['above_70_percent'] == int(np.count_nonzero(scores > 0.7))
+
+
+def test_quantiles_are_exact_until_the_buffer_fills():
+    scores = np.random.default_rng(2).random(StreamingStatistics().buffer_size)
+    statistics = feed(scores, 1000)
+
+    for q in (0.1, 0.5, 0.9):
+        assert statistics.quantile(q) == pytest.approx(
+            np.quantile(scores, q, method='hazen'), abs=1e-12)
+
+
+def test_merged_workers_match_a_single_accumulator():
+    scores = np.random.default_rng(3).random(400_000)
+    merged = feed(scores[:150_000], 4096)
+    merged.merge(feed(scores[150_000:], 4096))
+
+    assert merged.count == len(scores)
+    assert merged.mean == pytest.approx(scores.mean(), abs=1e-12)
+    for q in (0.5, 0.9):
+        assert abs(merged.quantile(q) - np.quantile(scores, q)) < 5e-4
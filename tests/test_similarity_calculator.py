@@ -0,0 +1,157 @@
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.preprocessing import normalize
+from utils.similarity_calculator import SimilarityCalculator, StreamingStatistics
+
+TOP_KS = [0, 1, 5, 40, 1000]
+
+
+def make_embeddings(seed: int, num_rows: int, num_terms: int = 200) -> sparse.csr_matrix:
+    """Random non-negative TF-IDF-like rows, a fifth of them exact duplicates"""
+    rng = np.random.default_rng(seed)
+    rows = sparse.random(num_rows, num_terms, density=0.05, format='csr',
+                         random_state=rng, dtype=np.float64)
+    copies = rng.choice(num_rows, size=num_rows // 5, replace=False)
+    rows = sparse.vstack([rows, rows[copies]], format='csr')
+    return rows[rng.permutation(rows.shape[0])]
+
+
+def per_job_top_k(jobs, resumes, top_k: int) -> tuple:
+    """Reference: calculate_similarities and get_top_k once per job"""
+    calculator = SimilarityCalculator()
+    results = [
+        calculator.get_top_k(calculator.calculate_similarities(job, resumes), top_k)
+        for job in jobs
+    ]
+    return [indices for indices, _ in results], [scores for _, scores in results]
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('top_k', TOP_KS)
+@pytest.mark.parametrize('block_size', [7, 64, 4096])
+def test_batch_top_k_matches_per_job_sparse(seed, top_k, block_size):
+    resumes = make_embeddings(seed, 300)
+    # Some jobs are copies of resumes, so they tie with those rows' duplicates
+    jobs = sparse.vstack([make_embeddings(seed + 100, 5), resumes[:3]], format='csr')
+
+    indices, scores = SimilarityCalculator().calculate_batch_top_k(
+        jobs, resumes, top_k=top_k, block_size=block_size)
+    expected_indices, expected_scores = per_job_top_k(jobs, resumes, top_k)
+
+    assert indices.shape == scores.shape == (jobs.shape[0], min(top_k, resumes.shape[0]))
+    for row in range(jobs.shape[0]):
+        np.testing.assert_array_equal(indices[row], expected_indices[row])
+        np.testing.assert_allclose(scores[row], expected_scores[row], rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('top_k', TOP_KS)
+def test_batch_top_k_matches_per_job_dense(top_k):
+    resumes = list(make_embeddings(0, 300).toarray())
+    jobs = make_embeddings(1, 6).toarray()
+
+    indices, scores = SimilarityCalculator().calculate_batch_top_k(
+        jobs, resumes, top_k=top_k, block_size=50)
+    expected_indices, expected_scores = per_job_top_k(jobs, resumes, top_k)
+
+    for row in range(len(jobs)):
+        np.testing.assert_array_equal(indices[row], expected_indices[row])
+        np.testing.assert_allclose(scores[row], expected_scores[row], rtol=0, atol=1e-12)
+
+
+def test_batch_top_k_zero_still_feeds_statistics():
+    resumes = make_embeddings(0, 100)
+    jobs = make_embeddings(1, 3)
+    statistics = [StreamingStatistics() for _ in range(jobs.shape[0])]
+
+    indices, scores = SimilarityCalculator().calculate_batch_top_k(
+        jobs, resumes, top_k=0, block_size=16, statistics=statistics)
+
+    assert indices.shape == scores.shape == (3, 0)
+    assert all(job_statistics.get_statistics()['count'] == resumes.shape[0]
+               for job_statistics in statistics)
+
+
+def brute_force_neighbors(embeddings, threshold, top_k) -> set:
+    """Reference: score the full n x n matrix, then select per row"""
+    matrix = normalize(embeddings, norm='l2')
+    scores = (matrix @ matrix.T).toarray()
+    np.fill_diagonal(scores, -np.inf)
+
+    pairs = {}
+    for row, row_scores in enumerate(scores):
+        if top_k is None:
+            columns = np.flatnonzero(row_scores >= threshold)
+        else:
+            # Stable sort keeps ties lowest index first
+            columns = np.argsort(-row_scores, kind='stable')[:top_k]
+            columns = columns[np.isfinite(row_scores[columns])]
+            if threshold is not None:
+                columns = columns[row_scores[columns] >= threshold]
+        pairs.update({(row, int(column)): row_scores[column] for column in columns})
+    return pairs
+
+
+def kept_pairs(neighbors: sparse.csr_matrix) -> dict:
+    coo = neighbors.tocoo()
+    return {(int(row), int(column)): value
+            for row, column, value in zip(coo.row, coo.col, coo.data)}
+
+
+@pytest.mark.parametrize('seed', range(3))
+@pytest.mark.parametrize('threshold, top_k', [
+    (0.3, None), (0.6, None), (None, 0), (None, 1), (None, 7), (None, 1000),
+    (0.2, 5), (0.5, 3),
+])
+@pytest.mark.parametrize('tile_size', [7, 64, 4096])
+def test_pairwise_neighbors_match_brute_force(seed, threshold, top_k, tile_size):
+    embeddings = make_embeddings(seed, 150)
+
+    neighbors = SimilarityCalculator().calculate_pairwise_neighbors(
+        embeddings, threshold=threshold, top_k=top_k, tile_size=tile_size)
+    expected = brute_force_neighbors(embeddings, threshold, top_k)
+    result = kept_pairs(neighbors)
+
+    assert neighbors.dtype == np.float32
+    assert sorted(result) == sorted(expected)
+    for pair, value in result.items():
+        assert value == pytest.approx(expected[pair], abs=1e-6)
+
+
+def as_input(embeddings: sparse.csr_matrix, kind: str):
+    if kind == 'list':
+        return list(embeddings.toarray())
+    if kind == 'ndarray':
+        return embeddings.toarray().astype(np.float32)
+    return embeddings
+
+
+@pytest.mark.parametrize('kind', ['list', 'ndarray', 'csr'])
+@pytest.mark.parametrize('split', ['blocks', 'blas'])
+@pytest.mark.parametrize('n_threads', [1, 3])
+@pytest.mark.parametrize('block_size', [1, 7, 64, 4096])
+def test_chunked_similarities_match_calculate_similarities(kind, split, n_threads,
+                                                           block_size):
+    embeddings = make_embeddings(0, 150)
+    resumes = as_input(embeddings, kind)
+    job = make_embeddings(1, 1).toarray().ravel()
+    statistics = StreamingStatistics()
+
+    chunked = SimilarityCalculator().calculate_similarities_chunked(
+        job, resumes, block_size=block_size, n_threads=n_threads, split=split,
+        statistics=statistics)
+    expected = SimilarityCalculator().calculate_similarities(job, embeddings)
+
+    np.testing.assert_allclose(chunked, expected, rtol=0, atol=1e-6)
+    assert statistics.count == len(expected)
+    assert statistics.mean == pytest.approx(np.mean(chunked), abs=1e-12)
+
+
+@pytest.mark.parametrize('kind', ['list', 'ndarray', 'csr'])
+@pytest.mark.parametrize('n_threads, block_size', [(0, 64), (-1, 64), (1, 0), (2, -5)])
+def test_chunked_similarities_reject_invalid_sizes(kind, n_threads, block_size):
+    resumes = as_input(make_embeddings(0, 10), kind)
+
+    with pytest.raises(ValueError):
+        SimilarityCalculator().calculate_similarities_chunked(
+            np.ones(200), resumes, block_size=block_size, n_threads=n_threads)
@@ -0,0 +1,179 @@
+import numpy as np
+from typing import List, Optional, Tuple
+from sklearn.feature_extraction.text import CountVectorizer
+from utils.embedding_service import EmbeddingService, TokenAnalyzer
+
+class BM25Index:
+    """Okapi BM25 keyword scoring over precomputed per-term postings"""
+    
+    def __init__(
+        self,
+        k1: float = 1.5,
+        b: float = 0.75,
+        max_tokens: Optional[int] = None,
+        embedding_service: Optional[EmbeddingService] = None
+    ):
+        """
+        Initialize an empty index
+        
+        Args:
+            k1: Term-frequency saturation
+            b: Strength of document length normalization (0 disables it)
+            max_tokens: Tokens kept per document, or None to index whole
+                resumes so long ones are length-normalized rather than cut
+            embedding_service: Service whose tokenizer is reused so BM25 and
+                TF-IDF see the same tokens; a default one is created if omitted
+        """
+        self.k1 = k1
+        self.b = b
+        self.max_tokens = max_tokens
+        self.tokenizer = embedding_service or EmbeddingService()
+        self.vectorizer = CountVectorizer(analyzer=TokenAnalyzer(ngram_range=(1, 1)))
+        self.weights = None
+        self.doc_lengths = None
+        self.average_doc_length = 0.0
+        self.idf = None
+    
+    def __len__(self) -> int:
+        return 0 if self.weights is None else self.weights.shape[0]
+    
+    def _tokenize(self, text: str) -> List[str]:
+        return self.tokenizer._preprocess_tokens(text, max_tokens=self.max_tokens)
+    
+    def fit(self, texts: List[str]) -> 'BM25Index':
+        """
+        Build length and term-frequency statistics and the weighted postings
+        
+        The BM25 weight of every (document, term) pair is computed here, so
+        scoring a query only sums the columns of its terms.
+        
+        Args:
+            texts: Resume texts to index
+            
+        Returns:
+            BM25Index: self, for chaining
+            
+        Raises:
+            Exception: If indexing fails
+        """
+        if not texts:
+            raise ValueError("Texts list cannot be empty")
+            
+        try:
+            counts = self.vectorizer.fit_transform(
+                [self._tokenize(text) for text in texts]
+            ).astype(np.float64)
+            
+            num_docs = counts.shape[0]
+            self.doc_lengths = np.asarray(counts.sum(axis=1)).ravel()
+            self.average_doc_length = max(self.doc_lengths.mean(), 1.0)
+            
+            # Non-negative IDF variant (as in Lucene) so common terms never subtract
+            doc_freqs = np.bincount(counts.indices, minlength=counts.shape[1])
+            self.idf = np.log1p((num_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+            
+            term_freqs = counts.data
+            lengths = np.repeat(self.doc_lengths, np.diff(counts.indptr))
+            norms = self.k1 * (1 - self.b + self.b * lengths / self.average_doc_length)
+            counts.data = (
+                self.idf[counts.indices] * term_freqs * (self.k1 + 1)
+                / (term_freqs + norms)
+            )
+            
+            # Column-major so a query touches only its own terms' postings
+            self.weights = counts.tocsc().astype(np.float32)
+            return self
+            
+        except Exception as e:
+            raise Exception(f"Failed to build BM25 index: {str(e)}")
+    
+    def score(self, query: str) -> np.ndarray:
+        """
+        BM25 score of every indexed document for a query
+        
+        Args:
+            query: Query text, e.g. the job description
+            
+        Returns:
+            np.ndarray: One non-negative score per document (0 when no
+                query term occurs in it)
+                
+        Raises:
+            Exception: If scoring fails
+        """
+        if self.weights is None:
+            raise ValueError("BM25 index must be fitted before scoring")
+            
+        try:
+            term_ids, query_freqs, _ = self._query_terms(query)
+            if len(term_ids) == 0:
+                return np.zeros(len(self))
+                
+            scores = self.weights[:, term_ids] @ query_freqs.astype(np.float32)
+            return np.asarray(scores, dtype=np.float64).ravel()
+            
+        except Exception as e:
+            raise Exception(f"Failed to calculate BM25 scores: {str(e)}")
+    
+    def max_score(self, query: str) -> float:
+        """
+        Upper bound on the BM25 score any document can reach for a query
+        
+        Term-frequency saturation caps each term at idf * (k1 + 1) per
+        occurrence in the query. Query terms missing from the index count
+        with the IDF of an unseen term, so a query the pool covers only in
+        part keeps a bound that reflects every term it asks for. Dividing
+        scores by this bound gives 0-1 values that do not depend on the
+        best resume of the pool.
+        
+        Args:
+            query: Query text, e.g. the job description
+            
+        Returns:
+            float: Maximum possible score (0 for a query without words)
+            
+        Raises:
+            Exception: If the bound cannot be calculated
+        """
+        if self.weights is None:
+            raise ValueError("BM25 index must be fitted before scoring")
+            
+        try:
+            term_ids, query_freqs, unseen_freqs = self._query_terms(query)
+            unseen_idf = np.log1p((len(self) + 0.5) / 0.5)
+            idf_sum = float(self.idf[term_ids] @ query_freqs) + unseen_idf * unseen_freqs
+            return (self.k1 + 1) * idf_sum
+            
+        except Exception as e:
+            raise Exception(f"Failed to calculate BM25 bound: {str(e)}")
+    
+    def _query_terms(self, query: str) -> Tuple[np.ndarray, np.ndarray, int]:
+        """
+        Indexed term ids of a query with their counts, plus the number of
+        query tokens missing from the index (a term repeated n times counts n
+        times)
+        """
+        vocabulary = self.vectorizer.vocabulary_
+        tokens = self.vectorizer.analyzer(self._tokenize(query))
+        terms = [vocabulary[token] for token in tokens if token in vocabulary]
+        term_ids, query_freqs = np.unique(
+            np.asarray(terms, dtype=np.int64), return_counts=True
+        )
+        return term_ids, query_freqs, len(tokens) - len(terms)
+    
+    def get_index_info(self) -> dict:
+        """
+        Get information about the index
+        
+        Returns:
+            dict: Parameters, document and term counts, average length
+        """
+        return {
+            'k1': self.k1,
+            'b': self.b,
+            'max_tokens': self.max_tokens,
+            'num_documents': len(self),
+            'num_terms': 0 if self.weights is None else self.weights.shape[1],
+            'postings': 0 if self.weights is None else self.weights.nnz,
+            'average_doc_length': float(self.average_doc_length)
+        }
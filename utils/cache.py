@@ -0,0 +1,242 @@
+from collections import OrderedDict
+from typing import Any, List, Optional, Tuple
+import hashlib
+import os
+import pickle
+import threading
+
+# Default size limit of the on-disk tier
+DEFAULT_MAX_DISK_BYTES = 1024 * 1024 * 1024
+
+# Disk eviction trims the tier to this fraction of max_disk_bytes, so it
+# does not rescan the directory on every write once the tier is full
+DISK_LOW_WATERMARK = 0.9
+
+class LRUCache:
+    """Bounded in-memory LRU cache with an optional on-disk tier"""
+    
+    def __init__(
+        self, 
+        max_entries: int = 10000, 
+        disk_dir: Optional[str] = None, 
+        max_disk_bytes: Optional[int] = DEFAULT_MAX_DISK_BYTES
+    ):
+        """
+        Initialize the cache
+        
+        Args:
+            max_entries: Maximum number of entries kept in memory
+            disk_dir: Directory for the on-disk tier, or None to keep memory only
+            max_disk_bytes: Size limit of the on-disk tier; when a write goes
+                over it, the least recently used files are deleted (None
+                lets the tier grow without limit)
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+            
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.disk_evictions = 0
+        self._disk_bytes = 0
+        
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._scan_disk())
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """
+        Build a content-addressed key from one or more strings
+        
+        Args:
+            *parts: Strings identifying the cached value
+            
+        Returns:
+            str: SHA-256 hex digest of the parts
+        """
+        digest = hashlib.sha256()
+        for part in parts:
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value, promoting disk hits into the memory tier
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Cached value, or None on a miss
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return self._entries[key]
+                
+        value = self._read_disk(key)
+        
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store_memory(key, value)
+            
+        return value
+    
+    def put(self, key: str, value: Any):
+        """
+        Store a value in memory and, if configured, on disk
+        
+        Args:
+            key: Cache key
+            value: Picklable value to cache
+        """
+        with self._lock:
+            self._store_memory(key, value)
+            
+        self._write_disk(key, value)
+    
+    def clear(self):
+        """Drop the memory tier and reset the counters (disk entries are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = 0
+            self.disk_hits = 0
+            self.misses = 0
+    
+    def get_stats(self) -> dict:
+        """
+        Get hit/miss counters for the cache
+        
+        Returns:
+            dict: Entry count, hits per tier, misses and hit rate
+        """
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'memory_hits': self.memory_hits,
+                'disk_hits': self.disk_hits,
+                'misses': self.misses,
+                'hit_rate': hits / lookups if lookups else 0.0,
+                'disk_dir': self.disk_dir,
+                'disk_bytes': self._disk_bytes,
+                'max_disk_bytes': self.max_disk_bytes,
+                'disk_evictions': self.disk_evictions
+            }
+    
+    def _store_memory(self, key: str, value: Any):
+        """Insert into the memory tier and evict the least recently used entries"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+    
+    def _disk_path(self, key: str) -> str:
+        """Path of the on-disk entry for a key, sharded by prefix"""
+        return os.path.join(self.disk_dir, key[:2], f"{key}.pkl")
+    
+    def _read_disk(self, key: str) -> Optional[Any]:
+        """Read an entry from the disk tier, treating unreadable files as misses"""
+        if not self.disk_dir:
+            return None
+            
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as cache_file:
+                value = pickle.load(cache_file)
+        except Exception:
+            return None
+            
+        try:
+            # The modification time is the recency used by disk eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+    
+    def _write_disk(self, key: str, value: Any):
+        """Write an entry to the disk tier; failures only cost a future miss"""
+        if not self.disk_dir:
+            return
+            
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a unique temporary file so concurrent writers never collide
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, 'wb') as cache_file:
+                pickle.dump(value, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            print(f"Cache write failed for {key}: {e}")
+            return
+            
+        with self._lock:
+            self._disk_bytes += size
+            over_limit = (
+                self.max_disk_bytes is not None and self._disk_bytes > self.max_disk_bytes
+            )
+        if over_limit:
+            self._evict_disk()
+    
+    def _scan_disk(self) -> List[Tuple[float, int, str]]:
+        """(modification time, size, path) of every entry in the disk tier"""
+        files = []
+        for shard in os.scandir(self.disk_dir):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith('.pkl'):
+                    continue
+                try:
+                    status = entry.stat()
+                except OSError:
+                    # Deleted by another process since the listing
+                    continue
+                files.append((status.st_mtime, status.st_size, entry.path))
+        return files
+    
+    def _evict_disk(self):
+        """Delete least recently used disk entries down to the low watermark"""
+        # One evicting thread is enough; the others keep serving requests
+        if not self._evict_lock.acquire(blocking=False):
+            return
+        try:
+            # Rescan rather than trust the running total, which misses
+            # writes and evictions by other processes sharing the directory
+            files = sorted(self._scan_disk())
+            total = sum(size for _, size, _ in files)
+            target = self.max_disk_bytes * DISK_LOW_WATERMARK
+            evicted = 0
+            for _, size, path in files:
+                if total <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                evicted += 1
+                
+            with self._lock:
+                self._disk_bytes = total
+                self.disk_evictions += evicted
+        except Exception as e:
+            print(f"Cache eviction failed: {e}")
+        finally:
+            self._evict_lock.release()
@@ -0,0 +1,146 @@
+import numpy as np
+from typing import List
+import zlib
+from utils.embedding_service import TOKEN_PATTERN
+
+# Signature value of texts without words, above any 32-bit hash
+EMPTY_HASH = np.uint64(1 << 32)
+
+class NearDuplicateDetector:
+    """Cluster near-duplicate resumes with MinHash signatures and LSH banding"""
+    
+    def __init__(
+        self,
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 5,
+        threshold: float = 0.75,
+        seed: int = 1
+    ):
+        """
+        Initialize the detector
+        
+        Two documents are candidates when all rows of at least one band of
+        their signatures agree; candidates are confirmed when the estimated
+        Jaccard similarity of their word shingles is at least threshold.
+        With the defaults (32 bands of 4 rows), pairs at 0.75 similarity
+        become candidates with probability above 0.9999.
+        
+        Args:
+            num_perm: Number of MinHash permutations (signature length)
+            bands: Number of LSH bands; must divide num_perm
+            shingle_size: Number of consecutive words per shingle
+            threshold: Minimum estimated Jaccard similarity of duplicates
+            seed: Seed of the hash permutations
+        """
+        if num_perm % bands != 0:
+            raise ValueError(f"bands ({bands}) must divide num_perm ({num_perm})")
+            
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+        self.threshold = threshold
+        
+        # Multiply-shift hashing: (a * x + b) mod 2^64, top 32 bits, with a odd
+        rng = np.random.default_rng(seed)
+        max_value = np.iinfo(np.uint64).max
+        self._a = rng.integers(
+            0, max_value, size=num_perm, dtype=np.uint64, endpoint=True
+        ) | np.uint64(1)
+        self._b = rng.integers(
+            0, max_value, size=num_perm, dtype=np.uint64, endpoint=True
+        )
+    
+    def _shingle_hashes(self, text: str) -> np.ndarray:
+        """32-bit hashes of the distinct word shingles of a text"""
+        tokens = TOKEN_PATTERN.findall(text.lower())
+        if not tokens:
+            return np.zeros(0, dtype=np.uint64)
+            
+        size = min(self.shingle_size, len(tokens))
+        shingles = {
+            ' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)
+        }
+        return np.fromiter(
+            (zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+            dtype=np.uint64, count=len(shingles)
+        )
+    
+    def signature(self, text: str) -> np.ndarray:
+        """
+        MinHash signature of one text
+        
+        Args:
+            text: Document text
+            
+        Returns:
+            np.ndarray: num_perm minimum 32-bit hash values (as uint64); all
+                EMPTY_HASH for texts without words
+        """
+        hashes = self._shingle_hashes(text)
+        if len(hashes) == 0:
+            return np.full(self.num_perm, EMPTY_HASH, dtype=np.uint64)
+            
+        # uint64 arithmetic wraps, which is the mod 2^64 of the hash family
+        permuted = (hashes[:, None] * self._a + self._b) >> np.uint64(32)
+        return permuted.min(axis=0)
+    
+    def find_clusters(self, texts: List[str]) -> np.ndarray:
+        """
+        Group near-duplicate texts into clusters
+        
+        Leader clustering: texts are visited in order, and each one joins the
+        most similar earlier representative whose estimated Jaccard similarity
+        with it is at least threshold, or becomes a representative itself.
+        Only representatives are indexed in the LSH buckets, so every member
+        is a near-duplicate of its own representative; a chain of successive
+        edits never pulls a text into the cluster of one it barely resembles.
+        
+        Args:
+            texts: Document texts, e.g. FileProcessor output
+            
+        Returns:
+            np.ndarray: For each text, the index of its cluster representative
+                (the lowest index in the cluster; unique texts map to themselves)
+                
+        Raises:
+            Exception: If clustering fails
+        """
+        try:
+            representatives = np.arange(len(texts))
+            if len(texts) < 2:
+                return representatives
+                
+            signatures = np.vstack([self.signature(text) for text in texts])
+            # Texts without words would all collide; keep them as singletons
+            has_words = signatures[:, 0] != EMPTY_HASH
+            band_keys = signatures.reshape(len(texts), self.bands, self.rows_per_band)
+            buckets = [{} for _ in range(self.bands)]
+            
+            for index in np.flatnonzero(has_words):
+                keys = [band_keys[index, band].tobytes() for band in range(self.bands)]
+                candidates = {
+                    leader
+                    for band, key in enumerate(keys)
+                    for leader in buckets[band].get(key, ())
+                }
+                
+                best_leader, best_similarity = None, self.threshold
+                for leader in sorted(candidates):
+                    similarity = np.mean(signatures[index] == signatures[leader])
+                    if similarity > best_similarity or (
+                        best_leader is None and similarity >= best_similarity
+                    ):
+                        best_leader, best_similarity = leader, similarity
+                
+                if best_leader is not None:
+                    representatives[index] = best_leader
+                else:
+                    for band, key in enumerate(keys):
+                        buckets[band].setdefault(key, []).append(index)
+            
+            return representatives
+            
+        except Exception as e:
+            raise Exception(f"Failed to find near-duplicate clusters: {str(e)}")
@@ -1,22 +1,133 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import (
+    ENGLISH_STOP_WORDS,
+    HashingVectorizer,
+    TfidfVectorizer,
+    strip_accents_unicode
+)
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+import sklearn
+import joblib
 import numpy as np
-from typing import List, Union
+from scipy import sparse
+from typing import List, Optional, Tuple, Union
 import streamlit as st
+from concurrent.futures import ProcessPoolExecutor
+import copy
+import hashlib
+import json
+import os
 import re
+import time
+import warnings
+from utils.cache import LRUCache
+
+# Bump when the persisted model layout changes
+MODEL_FORMAT_VERSION = 2
+
+# Same token definition as scikit-learn's default word analyzer
+TOKEN_PATTERN = re.compile(r"(?u)\b\w\w+\b")
+
+# Documents are truncated to this many tokens before vectorization
+MAX_TOKENS = 512
+
+
+class TokenAnalyzer:
+    """
+    Vectorizer analyzer that consumes pre-tokenized documents
+    
+    EmbeddingService tokenizes each document once in _preprocess_tokens; this
+    analyzer only drops stop words and forms n-grams from those tokens, so the
+    vectorizer does not tokenize the text a second time.
+    """
+    
+    def __init__(self, ngram_range: tuple = (1, 2)):
+        """
+        Initialize the analyzer
+        
+        Args:
+            ngram_range: Inclusive (min_n, max_n) range of word n-grams
+        """
+        self.ngram_range = ngram_range
+        self.stop_words = ENGLISH_STOP_WORDS
+    
+    def __call__(self, tokens: List[str]) -> List[str]:
+        """Turn a token list into stop-word-filtered word n-grams"""
+        tokens = [token for token in tokens if token not in self.stop_words]
+        min_n, max_n = self.ngram_range
+        
+        if max_n == 1:
+            return tokens
+        
+        ngrams = list(tokens) if min_n == 1 else []
+        for n in range(max(min_n, 2), max_n + 1):
+            ngrams.extend(
+                ' '.join(tokens[i:i + n]) for i in range(len(tokens) - n + 1)
+            )
+        return ngrams
+    
+    def __repr__(self) -> str:
+        # Stable repr so model fingerprints do not depend on object identity
+        return f"TokenAnalyzer(ngram_range={self.ngram_range})"
+
+# Fitted service held by each worker process of generate_embeddings_parallel
+_worker_service = None
+
+
+def _init_embedding_worker(service: 'EmbeddingService'):
+    """Receive the fitted model once per worker process"""
+    global _worker_service
+    _worker_service = service
+
+
+def _embed_shard(texts: List[str]) -> Union[sparse.csr_matrix, np.ndarray]:
+    """Preprocess and transform one shard inside a worker process"""
+    return _transform_texts(_worker_service, texts)
+
+
+def _transform_texts(
+    service: 'EmbeddingService', 
+    texts: List[str]
+) -> Union[sparse.csr_matrix, np.ndarray]:
+    """Preprocess and transform texts with a fitted service"""
+    processed_texts = [service._preprocess_tokens(text) for text in texts]
+    transformed = service._transform(processed_texts)
+    return sparse.csr_matrix(transformed) if sparse.issparse(transformed) else transformed
+
 
 class EmbeddingService:
     """Service for generating embeddings from text using TF-IDF vectorization"""
     
-    def __init__(self, max_features: int = 5000):
+    def __init__(
+        self, 
+        max_features: int = 5000, 
+        sparse_output: bool = False, 
+        cache: Optional[LRUCache] = None, 
+        reduced_dimensions: Optional[int] = None
+    ):
         """
         Initialize the embedding service
         
         Args:
             max_features: Maximum number of features for TF-IDF
+            sparse_output: Return embeddings as CSR matrices instead of dense arrays
+            cache: Optional embedding cache keyed by text and model fingerprint
+            reduced_dimensions: Project TF-IDF vectors to this many float32
+                dimensions with a fitted TruncatedSVD (LSA); 128-384 works well
         """
+        if reduced_dimensions is not None and reduced_dimensions < 1:
+            raise ValueError("reduced_dimensions must be a positive integer")
+        
         self.max_features = max_features
+        self.sparse_output = sparse_output
+        self.cache = cache
+        self.reduced_dimensions = reduced_dimensions
+        self.svd = None
         self.vectorizer = None
         self.is_fitted = False
+        self.fingerprint = None
+        self.model_path = None
+        self.read_only = False
         self._initialize_vectorizer()
     
     def _initialize_vectorizer(self):
@@ -24,16 +135,16 @@ class EmbeddingService:
         try:
             self.vectorizer = TfidfVectorizer(
                 max_features=self.max_features,
-                stop_words='english',
-                ngram_range=(1, 2),  # Use unigrams and bigrams
-                lowercase=True,
-                strip_accents='unicode'
+                analyzer=TokenAnalyzer(ngram_range=(1, 2)),  # Use unigrams and bigrams
+                token_pattern=None  # Tokenization happens in _preprocess_tokens
             )
+            self.svd = None
             self.is_fitted = False
+            self.fingerprint = None
         except Exception as e:
             raise Exception(f"Failed to initialize vectorizer: {str(e)}")
     
-    def generate_embedding(self, text: str) -> np.ndarray:
+    def generate_embedding(self, text: str) -> Union[np.ndarray, sparse.csr_matrix]:
         """
         Generate embedding for a single text
         
@@ -41,7 +152,8 @@ class EmbeddingService:
             text: Input text to generate embedding for
             
         Returns:
-            np.ndarray: Embedding vector
+            np.ndarray: Embedding vector, or a 1-row CSR matrix in sparse mode.
+                Reduced-dimension embeddings are always dense float32.
             
         Raises:
             Exception: If embedding generation fails
@@ -51,22 +163,32 @@ class EmbeddingService:
         
         try:
             # Preprocess text
-            processed_text = self._preprocess_text(text)
+            processed_text = self._preprocess_tokens(text)
             
             # If vectorizer is not fitted, fit it with this text
             if not self.is_fitted:
-                self.vectorizer.fit([processed_text])
-                self.is_fitted = True
+                self._fit([processed_text])
+                self._mark_fitted()
             
             # Generate embedding using TF-IDF
-            embedding = self.vectorizer.transform([processed_text]).toarray()[0]
+            embedding = self._embed([processed_text])
+            
+            # LSA projections are dense already
+            if not sparse.issparse(embedding):
+                return embedding[0]
+            
+            if self.sparse_output:
+                return embedding.tocsr()
             
-            return embedding
+            return embedding.toarray()[0]
             
         except Exception as e:
             raise Exception(f"Failed to generate embedding: {str(e)}")
     
-    def generate_embeddings_batch(self, texts: List[str]) -> List[np.ndarray]:
+    def generate_embeddings_batch(
+        self, 
+        texts: List[str]
+    ) -> Union[List[np.ndarray], sparse.csr_matrix]:
         """
         Generate embeddings for multiple texts in batch
         
@@ -74,65 +196,486 @@ class EmbeddingService:
             texts: List of input texts
             
         Returns:
-            List[np.ndarray]: List of embedding vectors
+            List[np.ndarray]: List of embedding vectors, or a CSR matrix with
+                one row per text in sparse mode. Reduced-dimension embeddings
+                come back as one dense float32 array with a row per text.
         """
         if not texts:
-            return []
+            return sparse.csr_matrix((0, 0)) if self.sparse_output else []
         
         try:
             # Preprocess all texts
-            processed_texts = [self._preprocess_text(text) for text in texts]
+            processed_texts = [self._preprocess_tokens(text) for text in texts]
             
             # Fit vectorizer with all texts if not fitted
             if not self.is_fitted:
-                self.vectorizer.fit(processed_texts)
-                self.is_fitted = True
+                self._fit(processed_texts)
+                self._mark_fitted()
             
             # Generate embeddings in batch (more efficient)
-            embeddings_matrix = self.vectorizer.transform(processed_texts).toarray()
+            embeddings_matrix = self._embed(processed_texts)
             
-            # Convert to list of arrays
-            return [embedding for embedding in embeddings_matrix]
+            return self._format_batch(embeddings_matrix)
             
         except Exception as e:
             raise Exception(f"Failed to generate batch embeddings: {str(e)}")
     
-    def fit_vectorizer(self, texts: List[str]):
+    def generate_chunk_embeddings(
+        self, 
+        texts: List[str], 
+        chunk_size: int = 256, 
+        max_chunks: int = 8
+    ) -> Tuple[Union[List[np.ndarray], sparse.csr_matrix, np.ndarray], np.ndarray]:
+        """
+        Embed long texts as fixed-size token windows instead of truncating them
+        
+        Every chunk holds at most chunk_size tokens and each text contributes at
+        most max_chunks chunks, so per-chunk cost is bounded. All chunks are
+        embedded in one batched transform; score them with
+        SimilarityCalculator.calculate_pooled_similarities.
+        
+        Args:
+            texts: List of input texts
+            chunk_size: Number of tokens per chunk
+            max_chunks: Maximum number of chunks per text
+            
+        Returns:
+            Tuple: Chunk embeddings (same format as generate_embeddings_batch)
+                and an array giving the index of the text each chunk came from
+        """
+        if chunk_size < 1 or max_chunks < 1:
+            raise ValueError("chunk_size and max_chunks must be positive")
+        
+        if not self.is_fitted:
+            raise ValueError("Vectorizer must be fitted before embedding chunks")
+        
+        if not texts:
+            return self.generate_embeddings_batch([]), np.zeros(0, dtype=np.int64)
+        
+        try:
+            chunks = []
+            owners = []
+            for text_index, text in enumerate(texts):
+                tokens = self._preprocess_tokens(
+                    text, max_tokens=chunk_size * max_chunks
+                )
+                
+                # Every text gets at least one (possibly empty) chunk
+                for start in range(0, max(len(tokens), 1), chunk_size):
+                    chunks.append(tokens[start:start + chunk_size])
+                    owners.append(text_index)
+            
+            embeddings_matrix = self._embed(chunks)
+            
+            chunk_owners = np.asarray(owners, dtype=np.int64)
+            return self._format_batch(embeddings_matrix), chunk_owners
+            
+        except Exception as e:
+            raise Exception(f"Failed to generate chunk embeddings: {str(e)}")
+    
+    def generate_embeddings_parallel(
+        self, 
+        texts: List[str], 
+        n_workers: Optional[int] = None, 
+        shard_size: int = 2000
+    ) -> Tuple[Union[List[np.ndarray], sparse.csr_matrix, np.ndarray], dict]:
+        """
+        Embed a large corpus by sharding preprocessing and transform over processes
+        
+        Each worker receives the fitted model once, then transforms shards of
+        texts. Shards come back as CSR matrices (or float32 arrays in LSA mode),
+        so only the non-zero values are pickled, and are stacked in input order.
+        The embedding cache is bypassed on this path.
+        
+        Args:
+            texts: List of input texts
+            n_workers: Number of worker processes (defaults to the CPU count)
+            shard_size: Number of texts per shard
+            
+        Returns:
+            Tuple: Embeddings (same format as generate_embeddings_batch) and a
+                dict with docs, seconds, docs_per_second, workers and shards
+        """
+        if not self.is_fitted:
+            raise ValueError("Vectorizer must be fitted before parallel embedding")
+        
+        if shard_size < 1:
+            raise ValueError("shard_size must be positive")
+        
+        n_workers = n_workers or os.cpu_count() or 1
+        shards = [
+            texts[start:start + shard_size] for start in range(0, len(texts), shard_size)
+        ]
+        
+        # Caches hold a lock and stay in this process
+        worker_service = copy.copy(self)
+        worker_service.cache = None
+        
+        start_time = time.perf_counter()
+        try:
+            if n_workers == 1 or len(shards) <= 1:
+                results = [
+                    _transform_texts(worker_service, shard) for shard in shards
+                ]
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=min(n_workers, len(shards)), 
+                    initializer=_init_embedding_worker, 
+                    initargs=(worker_service,)
+                ) as executor:
+                    results = list(executor.map(_embed_shard, shards))
+            
+            if not results:
+                embeddings = self.generate_embeddings_batch([])
+            elif sparse.issparse(results[0]):
+                embeddings = self._format_batch(sparse.vstack(results, format='csr'))
+            else:
+                embeddings = self._format_batch(np.vstack(results))
+            
+        except Exception as e:
+            raise Exception(f"Failed to generate parallel embeddings: {str(e)}")
+        
+        elapsed = time.perf_counter() - start_time
+        stats = {
+            'docs': len(texts),
+            'seconds': elapsed,
+            'docs_per_second': len(texts) / elapsed if elapsed > 0 else 0.0,
+            'workers': 1 if len(shards) <= 1 else min(n_workers, len(shards)),
+            'shards': len(shards)
+        }
+        return embeddings, stats
+    
+    def _format_batch(
+        self, 
+        embeddings_matrix: Union[sparse.csr_matrix, np.ndarray]
+    ) -> Union[List[np.ndarray], sparse.csr_matrix, np.ndarray]:
+        """Convert a batch of embeddings to the configured output format"""
+        # LSA projections are already compact dense arrays
+        if not sparse.issparse(embeddings_matrix):
+            return embeddings_matrix
+        
+        # Keep the sparse matrix as-is to avoid materializing zeros
+        if self.sparse_output:
+            return embeddings_matrix.tocsr()
+        
+        # Convert to list of arrays
+        return [embedding for embedding in embeddings_matrix.toarray()]
+    
+    def fit_vectorizer(self, texts: List[str], max_tokens: Optional[int] = MAX_TOKENS):
         """
         Fit the vectorizer with a corpus of texts
         
         Args:
             texts: List of texts to fit the vectorizer on
+            max_tokens: Tokens of each text the vocabulary and IDF are fitted
+                on; raise it (e.g. to chunk_size * max_chunks) when scoring
+                chunks beyond the first MAX_TOKENS, or None to use all
         """
+        self._check_writable()
+        
         try:
-            processed_texts = [self._preprocess_text(text) for text in texts]
-            self.vectorizer.fit(processed_texts)
-            self.is_fitted = True
+            processed_texts = [
+                self._preprocess_tokens(text, max_tokens=max_tokens) for text in texts
+            ]
+            self._fit(processed_texts)
+            self._mark_fitted()
+            self.model_path = None
         except Exception as e:
             raise Exception(f"Failed to fit vectorizer: {str(e)}")
     
-    def _preprocess_text(self, text: str) -> str:
+    def fit_scoped(
+        self, 
+        texts: List[str], 
+        max_tokens: Optional[int] = MAX_TOKENS
+    ) -> 'EmbeddingService':
+        """
+        Fit a new, read-only service on texts without touching this one
+        
+        The shared service from initialize_services is used by every session,
+        so per-request fitting must not mutate it. The returned copy has the
+        same settings, its own fitted vectorizer and no embedding cache, and
+        is frozen.
+        
+        Args:
+            texts: List of texts to fit the vectorizer on
+            max_tokens: Tokens of each text to fit on (see fit_vectorizer)
+            
+        Returns:
+            EmbeddingService: Fitted, read-only service scoped to the caller
+        """
+        scoped = copy.copy(self)
+        scoped.read_only = False
+        # A new model means a new fingerprint, so cached rows would never be
+        # reused; keep the shared cache for the long-lived model only
+        scoped.cache = None
+        scoped._initialize_vectorizer()
+        scoped.model_path = None
+        scoped.fit_vectorizer(texts, max_tokens=max_tokens)
+        return scoped.freeze()
+    
+    def freeze(self) -> 'EmbeddingService':
+        """
+        Mark the fitted service as read-only so it can be shared across threads
+        
+        A frozen service only transforms; fitting, loading or adding documents
+        raises instead of changing the model under concurrent readers.
+        
+        Returns:
+            EmbeddingService: This service, for chaining
+        """
+        if not self.is_fitted:
+            raise ValueError("Vectorizer must be fitted before it can be frozen")
+        self.read_only = True
+        return self
+    
+    def _check_writable(self):
+        """Raise if the service has been frozen"""
+        if self.read_only:
+            raise RuntimeError(
+                "Embedding service is read-only; use fit_scoped for per-request models"
+            )
+    
+    def _fit(self, processed_texts: List[List[str]]):
+        """Fit the underlying vectorizer, and the LSA projection if enabled"""
+        if self.reduced_dimensions is None:
+            self.vectorizer.fit(processed_texts)
+            return
+        
+        tfidf_matrix = self.vectorizer.fit_transform(processed_texts)
+        
+        # TruncatedSVD needs fewer components than features, and cannot find
+        # more components than there are documents
+        n_components = max(1, min(
+            self.reduced_dimensions, tfidf_matrix.shape[1] - 1, tfidf_matrix.shape[0]
+        ))
+        self.svd = TruncatedSVD(n_components=n_components, random_state=42)
+        self.svd.fit(tfidf_matrix)
+    
+    def _transform(
+        self, 
+        processed_texts: List[List[str]]
+    ) -> Union[sparse.csr_matrix, np.ndarray]:
+        """Transform preprocessed texts into TF-IDF rows or LSA vectors"""
+        tfidf_matrix = self.vectorizer.transform(processed_texts)
+        
+        if self.svd is None:
+            return tfidf_matrix
+        
+        reduced = self.svd.transform(tfidf_matrix).astype(np.float32)
+        return normalize(reduced, norm='l2')
+    
+    def _embed(
+        self, 
+        processed_texts: List[List[str]]
+    ) -> Union[sparse.csr_matrix, np.ndarray]:
+        """
+        Transform preprocessed texts, serving repeated texts from the cache
+        
+        Only cache misses are transformed, in a single batch.
+        
+        Args:
+            processed_texts: Preprocessed texts
+            
+        Returns:
+            sparse.csr_matrix: One embedding row per text (dense in LSA mode)
+        """
+        if self.cache is None:
+            return self._transform(processed_texts)
+        
+        keys = [
+            LRUCache.make_key(self.fingerprint, ' '.join(tokens))
+            for tokens in processed_texts
+        ]
+        rows = [self.cache.get(key) for key in keys]
+        missing = [i for i, row in enumerate(rows) if row is None]
+        
+        if missing:
+            computed = self._transform([processed_texts[i] for i in missing])
+            if sparse.issparse(computed):
+                computed = sparse.csr_matrix(computed)
+            
+            for position, i in enumerate(missing):
+                row = computed[position]
+                # Copy dense rows so cached entries don't pin the whole batch
+                rows[i] = row if sparse.issparse(row) else row.copy()
+                self.cache.put(keys[i], rows[i])
+            
+            if len(missing) == len(rows):
+                return computed
+        
+        if sparse.issparse(rows[0]):
+            return sparse.vstack(rows, format='csr')
+        return np.vstack(rows)
+    
+    def save_vectorizer(self, path: str) -> str:
+        """
+        Persist the fitted vectorizer to disk together with its fingerprint
+        
+        Args:
+            path: Destination file path
+            
+        Returns:
+            str: Fingerprint of the saved model
+            
+        Raises:
+            ValueError: If the vectorizer has not been fitted
+        """
+        if not self.is_fitted:
+            raise ValueError("Vectorizer must be fitted before it can be saved")
+        
+        try:
+            payload = {
+                'format_version': MODEL_FORMAT_VERSION,
+                'sklearn_version': sklearn.__version__,
+                'model_type': type(self).__name__,
+                'max_features': self.max_features,
+                'fingerprint': self.fingerprint
+            }
+            payload.update(self._get_model_state())
+            
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+            
+            # Write to a temporary file first so readers never see a partial model
+            temp_path = f"{path}.tmp"
+            joblib.dump(payload, temp_path)
+            os.replace(temp_path, path)
+            
+            return self.fingerprint
+            
+        except Exception as e:
+            raise Exception(f"Failed to save vectorizer: {str(e)}")
+    
+    def load_vectorizer(self, path: str):
+        """
+        Load a vectorizer previously saved with save_vectorizer
+        
+        Args:
+            path: Path of the saved model
+            
+        Raises:
+            ValueError: If the file format or fingerprint does not match
+        """
+        self._check_writable()
+        
+        try:
+            payload = joblib.load(path)
+        except Exception as e:
+            raise Exception(f"Failed to load vectorizer: {str(e)}")
+        
+        if payload.get('format_version') != MODEL_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported model format version {payload.get('format_version')} "
+                f"(expected {MODEL_FORMAT_VERSION})"
+            )
+        
+        if payload.get('model_type', 'EmbeddingService') != type(self).__name__:
+            raise ValueError(
+                f"Saved model is a {payload.get('model_type')}, "
+                f"cannot load it into {type(self).__name__}"
+            )
+        
+        if payload.get('sklearn_version') != sklearn.__version__:
+            warnings.warn(
+                f"Model was saved with scikit-learn {payload.get('sklearn_version')}, "
+                f"running {sklearn.__version__}"
+            )
+        
+        self.max_features = payload['max_features']
+        self._set_model_state(payload)
+        self._mark_fitted()
+        
+        # The stored fingerprint guards against a corrupted or edited model
+        if self.fingerprint != payload.get('fingerprint'):
+            self._initialize_vectorizer()
+            raise ValueError("Model fingerprint mismatch; the saved file may be corrupted")
+        
+        self.model_path = path
+    
+    @classmethod
+    def from_saved_vectorizer(cls, path: str, **kwargs) -> 'EmbeddingService':
         """
-        Preprocess text before embedding generation
+        Create a service from a vectorizer saved with save_vectorizer
+        
+        Args:
+            path: Path of the saved model
+            **kwargs: Additional constructor arguments
+            
+        Returns:
+            EmbeddingService: Service ready to transform texts
+        """
+        service = cls(**kwargs)
+        service.load_vectorizer(path)
+        return service
+    
+    def _get_model_state(self) -> dict:
+        """Fitted objects to persist alongside the model metadata"""
+        return {
+            'vectorizer': self.vectorizer,
+            'reduced_dimensions': self.reduced_dimensions,
+            'svd': self.svd
+        }
+    
+    def _set_model_state(self, state: dict):
+        """Restore fitted objects produced by _get_model_state"""
+        self.vectorizer = state['vectorizer']
+        self.reduced_dimensions = state.get('reduced_dimensions')
+        self.svd = state.get('svd')
+    
+    def _mark_fitted(self):
+        """Flag the vectorizer as fitted and refresh its fingerprint"""
+        self.is_fitted = True
+        self.fingerprint = self._compute_fingerprint()
+    
+    def _compute_fingerprint(self) -> str:
+        """
+        Compute a version fingerprint from the fitted vocabulary and IDF weights
+        
+        Returns:
+            str: Hex digest identifying the fitted model
+        """
+        digest = hashlib.sha256()
+        digest.update(f"format={MODEL_FORMAT_VERSION}".encode('utf-8'))
+        
+        params = self.vectorizer.get_params()
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+        
+        vocabulary = sorted(
+            (term, int(index)) for term, index in self.vectorizer.vocabulary_.items()
+        )
+        digest.update(json.dumps(vocabulary).encode('utf-8'))
+        digest.update(np.ascontiguousarray(self.vectorizer.idf_).tobytes())
+        
+        if self.svd is not None:
+            digest.update(np.ascontiguousarray(self.svd.components_).tobytes())
+        
+        return digest.hexdigest()[:16]
+    
+    def _preprocess_tokens(
+        self, 
+        text: str, 
+        max_tokens: Optional[int] = MAX_TOKENS
+    ) -> List[str]:
+        """
+        Tokenize text once for both truncation and vectorization
         
         Args:
             text: Raw input text
+            max_tokens: Number of tokens to keep, or None to keep all
             
         Returns:
-            str: Preprocessed text
+            List[str]: Lowercased, accent-stripped tokens, truncated to max_tokens
         """
-        # Basic text preprocessing
-        processed = text.strip()
+        text = text.lower()
         
-        # Remove excessive whitespace
-        processed = ' '.join(processed.split())
+        # Strip accents like TfidfVectorizer(strip_accents='unicode') before
+        # tokenizing: combining marks of decomposed (NFD) text, common from
+        # macOS and PDF extraction, would otherwise split words apart
+        if not text.isascii():
+            text = strip_accents_unicode(text)
         
         # Truncate if too long (model limitations)
-        max_length = 512  # Most sentence transformers have this limit
-        if len(processed.split()) > max_length:
-            processed = ' '.join(processed.split()[:max_length])
-        
-        return processed
+        return TOKEN_PATTERN.findall(text)[:max_tokens]
     
     def get_embedding_dimension(self) -> int:
         """
@@ -144,8 +687,10 @@ class EmbeddingService:
         try:
             if not self.is_fitted:
                 # Fit with a test text to get dimension
-                self.vectorizer.fit(["test text"])
-                self.is_fitted = True
+                self._fit([self._preprocess_tokens("test text")])
+                self._mark_fitted()
+            if self.svd is not None:
+                return self.svd.components_.shape[0]
             return len(self.vectorizer.get_feature_names_out())
         except Exception as e:
             raise Exception(f"Failed to get embedding dimension: {str(e)}")
@@ -160,6 +705,194 @@ class EmbeddingService:
         return {
             'vectorizer_type': 'TF-IDF',
             'max_features': self.max_features,
+            'sparse_output': self.sparse_output,
+            'reduced_dimensions': self.reduced_dimensions,
             'embedding_dimension': self.get_embedding_dimension() if self.is_fitted else 'Not fitted yet',
-            'is_fitted': self.is_fitted
+            'is_fitted': self.is_fitted,
+            'fingerprint': self.fingerprint,
+            'model_path': self.model_path,
+            'read_only': self.read_only,
+            'cache': self.cache.get_stats() if self.cache is not None else None
         }
+
+
+class IncrementalEmbeddingService(EmbeddingService):
+    """
+    TF-IDF embeddings over hashed features with a running document-frequency table
+    
+    New documents are absorbed with add_documents, which only touches the new
+    documents' features, so ingestion cost scales with the batch rather than
+    with the size of the corpus seen so far.
+    """
+    
+    def __init__(
+        self, 
+        n_features: int = 2 ** 18, 
+        sparse_output: bool = True, 
+        cache: Optional[LRUCache] = None
+    ):
+        """
+        Initialize the incremental embedding service
+        
+        Args:
+            n_features: Number of hashed feature buckets
+            sparse_output: Return embeddings as CSR matrices instead of dense arrays
+            cache: Optional embedding cache keyed by text and model fingerprint
+        """
+        super().__init__(
+            max_features=n_features, sparse_output=sparse_output, cache=cache
+        )
+    
+    def _initialize_vectorizer(self):
+        """Initialize the stateless hashing vectorizer and reset IDF statistics"""
+        try:
+            self.vectorizer = HashingVectorizer(
+                n_features=self.max_features,
+                analyzer=TokenAnalyzer(ngram_range=(1, 2)),  # Use unigrams and bigrams
+                token_pattern=None,  # Tokenization happens in _preprocess_tokens
+                alternate_sign=False,
+                norm=None  # Raw term counts; IDF and L2 norm are applied later
+            )
+            self.document_frequencies = np.zeros(self.max_features, dtype=np.int64)
+            self.num_documents = 0
+            self.idf = None
+            self.is_fitted = False
+            self.fingerprint = None
+        except Exception as e:
+            raise Exception(f"Failed to initialize vectorizer: {str(e)}")
+    
+    def add_documents(self, texts: List[str]) -> sparse.csr_matrix:
+        """
+        Absorb new documents into the document-frequency statistics
+        
+        Args:
+            texts: New documents to add to the corpus
+            
+        Returns:
+            sparse.csr_matrix: Raw term counts of the new documents
+        """
+        self._check_writable()
+        
+        if not texts:
+            return sparse.csr_matrix((0, self.max_features))
+        
+        try:
+            processed_texts = [self._preprocess_tokens(text) for text in texts]
+            term_counts = self._absorb(processed_texts)
+            self._mark_fitted()
+            self.model_path = None
+            return term_counts
+        except Exception as e:
+            raise Exception(f"Failed to add documents: {str(e)}")
+    
+    def rescale_embeddings(
+        self, 
+        embeddings: sparse.spmatrix, 
+        previous_idf: np.ndarray
+    ) -> sparse.csr_matrix:
+        """
+        Bring stored embeddings up to date with the current IDF weights
+        
+        Embeddings are L2-normalized TF-IDF rows, so multiplying each stored
+        weight by the ratio of new to old IDF and renormalizing gives the same
+        result as re-embedding the original text, without re-tokenizing it.
+        
+        Args:
+            embeddings: Embeddings produced when previous_idf was current
+            previous_idf: Value of the idf attribute when embeddings were made
+            
+        Returns:
+            sparse.csr_matrix: Embeddings under the current IDF weights
+        """
+        if not self.is_fitted:
+            raise ValueError("No documents have been added yet")
+        
+        rescaled = sparse.csr_matrix(embeddings, dtype=np.float64, copy=True)
+        ratio = self.idf / previous_idf
+        rescaled.data *= ratio[rescaled.indices]
+        return normalize(rescaled, norm='l2')
+    
+    def _absorb(self, processed_texts: List[List[str]]) -> sparse.csr_matrix:
+        """Count terms in new documents and update the running statistics"""
+        term_counts = self.vectorizer.transform(processed_texts).tocsr()
+        term_counts.sum_duplicates()
+        
+        # Each stored entry is one (document, feature) occurrence
+        new_frequencies = np.bincount(term_counts.indices, minlength=self.max_features)
+        
+        # Swap in fresh arrays rather than mutating, so callers holding the
+        # previous idf can still use it for rescale_embeddings
+        self.document_frequencies = self.document_frequencies + new_frequencies
+        self.num_documents += len(processed_texts)
+        self.idf = self._compute_idf()
+        
+        return term_counts
+    
+    def _compute_idf(self) -> np.ndarray:
+        """Smoothed IDF, matching TfidfVectorizer(smooth_idf=True)"""
+        return np.log((1 + self.num_documents) / (1 + self.document_frequencies)) + 1
+    
+    def _fit(self, processed_texts: List[List[str]]):
+        """Rebuild the statistics from scratch on the given texts"""
+        self._initialize_vectorizer()
+        self._absorb(processed_texts)
+    
+    def _transform(self, processed_texts: List[List[str]]) -> sparse.csr_matrix:
+        """Hash texts and weight the counts with the current IDF"""
+        term_counts = self.vectorizer.transform(processed_texts).tocsr()
+        term_counts.data = term_counts.data * self.idf[term_counts.indices]
+        return normalize(term_counts, norm='l2')
+    
+    def _get_model_state(self) -> dict:
+        """Document-frequency statistics to persist alongside the model metadata"""
+        return {
+            'vectorizer': self.vectorizer,
+            'document_frequencies': self.document_frequencies,
+            'num_documents': self.num_documents
+        }
+    
+    def _set_model_state(self, state: dict):
+        """Restore statistics produced by _get_model_state"""
+        self.vectorizer = state['vectorizer']
+        self.document_frequencies = state['document_frequencies']
+        self.num_documents = state['num_documents']
+        self.idf = self._compute_idf()
+    
+    def _compute_fingerprint(self) -> str:
+        """
+        Compute a version fingerprint from the hashing setup and IDF statistics
+        
+        Returns:
+            str: Hex digest identifying the current statistics
+        """
+        digest = hashlib.sha256()
+        digest.update(f"format={MODEL_FORMAT_VERSION}".encode('utf-8'))
+        
+        params = self.vectorizer.get_params()
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode('utf-8'))
+        
+        digest.update(f"documents={self.num_documents}".encode('utf-8'))
+        digest.update(np.ascontiguousarray(self.document_frequencies).tobytes())
+        
+        return digest.hexdigest()[:16]
+    
+    def get_embedding_dimension(self) -> int:
+        """
+        Get the dimension of embeddings produced by this vectorizer
+        
+        Returns:
+            int: Embedding dimension (number of hashed features)
+        """
+        return self.max_features
+    
+    def get_model_info(self) -> dict:
+        """
+        Get information about the vectorizer
+        
+        Returns:
+            dict: Vectorizer information
+        """
+        info = super().get_model_info()
+        info['vectorizer_type'] = 'Hashed TF-IDF (incremental)'
+        info['num_documents'] = self.num_documents
+        return info
@@ -0,0 +1,394 @@
+import numpy as np
+from scipy import sparse
+from typing import List, Optional, Sequence, Union
+from sklearn.preprocessing import normalize
+import json
+import os
+import threading
+from utils.similarity_calculator import SimilarityCalculator
+
+# Bump when the on-disk layout changes
+STORE_FORMAT_VERSION = 1
+
+# File names inside a store directory
+META_FILE = 'meta.json'
+IDS_FILE = 'ids.jsonl'
+DELETED_FILE = 'deleted.u8'
+DENSE_FILE = 'vectors.f32'
+DATA_FILE = 'data.f32'
+INDICES_FILE = 'indices.i32'
+INDPTR_FILE = 'indptr.i64'
+
+class EmbeddingStore:
+    """Append-only, memory-mapped store of resume embeddings on disk"""
+    
+    def __init__(self, path: str, fingerprint: Optional[str] = None):
+        """
+        Open the store at path, creating an empty one if it does not exist
+        
+        The layout (sparse CSR or dense float32) and dimension are fixed by
+        the first append. Rows are L2-normalized on append, so a dot product
+        with a unit-length job vector is the cosine similarity.
+        
+        Vectors are read through read-only memory maps: processes that open
+        the same directory share one copy in the OS page cache instead of
+        each loading the pool into RAM. meta.json is the commit point; rows
+        written past the committed count are ignored by readers and
+        truncated by the next append. Only one process should write at a
+        time.
+        
+        Args:
+            path: Directory holding the store files
+            fingerprint: Fingerprint of the embedding model (see
+                EmbeddingService.fingerprint); opening a store written by a
+                different model raises ValueError
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(self.path, exist_ok=True)
+        
+        if not os.path.exists(self._file(META_FILE)):
+            self._write_meta({
+                'format_version': STORE_FORMAT_VERSION,
+                'layout': None,
+                'dimension': None,
+                'num_rows': 0,
+                'nnz': 0,
+                'fingerprint': fingerprint
+            })
+            
+        self.refresh()
+        
+        if fingerprint and self.fingerprint and fingerprint != self.fingerprint:
+            raise ValueError(
+                f"Store was written by model {self.fingerprint}, "
+                f"expected {fingerprint}"
+            )
+        if fingerprint and not self.fingerprint:
+            self._meta['fingerprint'] = fingerprint
+            self._write_meta(self._meta)
+            self.fingerprint = fingerprint
+    
+    def __len__(self) -> int:
+        """Number of rows, including deleted ones (row numbers are never reused)"""
+        return self.num_rows
+    
+    @property
+    def num_live(self) -> int:
+        """Number of rows that have not been deleted"""
+        return int(self.num_rows - np.count_nonzero(self._deleted))
+    
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+    
+    def refresh(self):
+        """
+        Re-read the committed state, picking up rows appended by other processes
+        
+        Deletes made by other processes are visible without a refresh, since
+        the tombstone file is shared through the memory map.
+        """
+        try:
+            with open(self._file(META_FILE), 'r', encoding='utf-8') as meta_file:
+                meta = json.load(meta_file)
+        except Exception as e:
+            raise Exception(f"Failed to read embedding store: {str(e)}")
+            
+        if meta.get('format_version') != STORE_FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported embedding store format {meta.get('format_version')} "
+                f"(expected {STORE_FORMAT_VERSION})"
+            )
+            
+        self._meta = meta
+        self.layout = meta['layout']
+        self.dimension = meta['dimension']
+        self.num_rows = meta['num_rows']
+        self.nnz = meta['nnz']
+        self.fingerprint = meta['fingerprint']
+        
+        self._deleted = self._map(DELETED_FILE, np.uint8, (self.num_rows,))
+        if self.layout == 'dense':
+            self._vectors = self._map(
+                DENSE_FILE, np.float32, (self.num_rows, self.dimension)
+            )
+        elif self.layout == 'sparse':
+            self._data = self._map(DATA_FILE, np.float32, (self.nnz,))
+            self._indices = self._map(INDICES_FILE, np.int32, (self.nnz,))
+            self._indptr = self._map(INDPTR_FILE, np.int64, (self.num_rows + 1,))
+            
+        self.row_ids = self._read_ids()
+    
+    def _map(self, name: str, dtype: type, shape: tuple) -> np.ndarray:
+        """Read-only memory map of the committed part of a store file"""
+        if int(np.prod(shape)) == 0:
+            # mmap cannot map zero bytes
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self._file(name), dtype=dtype, mode='r', shape=shape)
+    
+    def _read_ids(self) -> List[str]:
+        """Identifiers of the committed rows"""
+        if not self.num_rows:
+            return []
+            
+        row_ids = []
+        with open(self._file(IDS_FILE), 'r', encoding='utf-8') as ids_file:
+            for line in ids_file:
+                if len(row_ids) == self.num_rows:
+                    break
+                row_ids.append(json.loads(line))
+        return row_ids
+    
+    def _write_meta(self, meta: dict):
+        """Atomically replace meta.json, committing everything written before it"""
+        temp_path = f"{self._file(META_FILE)}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file, indent=2)
+            meta_file.flush()
+            os.fsync(meta_file.fileno())
+        os.replace(temp_path, self._file(META_FILE))
+    
+    def append(
+        self,
+        embeddings: Union[List[np.ndarray], np.ndarray, sparse.spmatrix],
+        row_ids: Optional[Sequence[str]] = None
+    ) -> np.ndarray:
+        """
+        Append embeddings to the end of the store
+        
+        Args:
+            embeddings: List of vectors, a 2D array, or a sparse matrix with
+                one resume per row
+            row_ids: Identifier of each row (e.g. file name); defaults to
+                the row numbers
+                
+        Returns:
+            np.ndarray: Row numbers assigned to the new embeddings
+        """
+        layout = 'sparse' if sparse.issparse(embeddings) else 'dense'
+        if layout == 'sparse':
+            matrix = sparse.csr_matrix(embeddings, dtype=np.float32)
+            matrix = normalize(matrix, norm='l2')
+            matrix.sort_indices()
+        else:
+            matrix = np.asarray(np.vstack(embeddings), dtype=np.float32)
+            matrix = normalize(matrix, norm='l2')
+        num_new, dimension = matrix.shape
+        
+        with self._lock:
+            self.refresh()
+            
+            if row_ids is None:
+                row_ids = range(self.num_rows, self.num_rows + num_new)
+            if len(row_ids) != num_new:
+                raise ValueError(f"Got {len(row_ids)} row ids for {num_new} embeddings")
+            if self.layout and layout != self.layout:
+                raise ValueError(f"Store holds {self.layout} embeddings, got {layout}")
+            if self.dimension and dimension != self.dimension:
+                raise ValueError(
+                    f"Store holds {self.dimension}-dimensional embeddings, "
+                    f"got {dimension}"
+                )
+                
+            try:
+                self._truncate_uncommitted(layout)
+                
+                if layout == 'sparse':
+                    indptr = matrix.indptr.astype(np.int64)[1:] + self.nnz
+                    if self.num_rows == 0:
+                        indptr = np.concatenate([[0], indptr])
+                    self._append_array(DATA_FILE, matrix.data.astype(np.float32))
+                    self._append_array(INDICES_FILE, matrix.indices.astype(np.int32))
+                    self._append_array(INDPTR_FILE, indptr)
+                else:
+                    self._append_array(DENSE_FILE, matrix)
+                    
+                self._append_array(DELETED_FILE, np.zeros(num_new, dtype=np.uint8))
+                with open(self._file(IDS_FILE), 'a', encoding='utf-8') as ids_file:
+                    for row_id in row_ids:
+                        ids_file.write(json.dumps(str(row_id)) + '\n')
+                    ids_file.flush()
+                    os.fsync(ids_file.fileno())
+                    
+                first_row = self.num_rows
+                self._meta.update({
+                    'layout': layout,
+                    'dimension': dimension,
+                    'num_rows': self.num_rows + num_new,
+                    'nnz': self.nnz + (matrix.nnz if layout == 'sparse' else 0)
+                })
+                self._write_meta(self._meta)
+                self.refresh()
+                
+                return np.arange(first_row, first_row + num_new)
+                
+            except Exception as e:
+                raise Exception(f"Failed to append to embedding store: {str(e)}")
+    
+    def _append_array(self, name: str, values: np.ndarray):
+        """Append raw array bytes to a store file and flush them to disk"""
+        with open(self._file(name), 'ab') as store_file:
+            store_file.write(np.ascontiguousarray(values).tobytes())
+            store_file.flush()
+            os.fsync(store_file.fileno())
+    
+    def _truncate_uncommitted(self, layout: str):
+        """Drop bytes left behind by an append that never reached meta.json"""
+        sizes = {DELETED_FILE: self.num_rows}
+        if layout == 'sparse':
+            sizes.update({
+                DATA_FILE: self.nnz * 4,
+                INDICES_FILE: self.nnz * 4,
+                INDPTR_FILE: (self.num_rows + 1) * 8 if self.num_rows else 0
+            })
+        else:
+            sizes[DENSE_FILE] = self.num_rows * (self.dimension or 0) * 4
+            
+        for name, size in sizes.items():
+            path = self._file(name)
+            if os.path.exists(path) and os.path.getsize(path) > size:
+                os.truncate(path, size)
+                
+        # Row ids are one line per row
+        if os.path.exists(self._file(IDS_FILE)):
+            with open(self._file(IDS_FILE), 'rb') as ids_file:
+                lines = ids_file.readlines()
+            if len(lines) != self.num_rows:
+                with open(self._file(IDS_FILE), 'wb') as ids_file:
+                    ids_file.writelines(lines[:self.num_rows])
+    
+    def delete(self, rows: Sequence[int]) -> int:
+        """
+        Mark rows as deleted; their vectors stay on disk but are never returned
+        
+        Args:
+            rows: Row numbers to delete
+            
+        Returns:
+            int: Number of rows that were not already deleted
+        """
+        rows = np.unique(np.asarray(rows, dtype=np.int64))
+        if len(rows) == 0:
+            return 0
+        if rows[0] < 0 or rows[-1] >= self.num_rows:
+            raise ValueError(f"Row numbers must be between 0 and {self.num_rows - 1}")
+            
+        with self._lock:
+            try:
+                tombstones = np.memmap(
+                    self._file(DELETED_FILE), dtype=np.uint8, mode='r+',
+                    shape=(self.num_rows,)
+                )
+                newly_deleted = int(np.count_nonzero(tombstones[rows] == 0))
+                tombstones[rows] = 1
+                tombstones.flush()
+                del tombstones
+                return newly_deleted
+                
+            except Exception as e:
+                raise Exception(f"Failed to delete from embedding store: {str(e)}")
+    
+    def delete_ids(self, row_ids: Sequence[str]) -> int:
+        """
+        Mark every row with one of the given identifiers as deleted
+        
+        Args:
+            row_ids: Row identifiers passed to append
+            
+        Returns:
+            int: Number of rows that were not already deleted
+        """
+        wanted = set(row_ids)
+        rows = [row for row, row_id in enumerate(self.row_ids) if row_id in wanted]
+        return self.delete(rows)
+    
+    def live_mask(self) -> np.ndarray:
+        """Boolean mask of rows that have not been deleted"""
+        return self._deleted == 0
+    
+    def get_embeddings(self) -> Union[np.ndarray, sparse.csr_matrix]:
+        """
+        All committed rows, backed by the memory-mapped files
+        
+        Vector values and column indices are not copied into memory.
+        
+        Deleted rows are included so row numbers stay valid; combine with
+        live_mask() to skip them.
+        
+        Returns:
+            Union[np.ndarray, sparse.csr_matrix]: Read-only dense array or
+                CSR matrix with one resume per row
+        """
+        if self.layout == 'dense':
+            return self._vectors
+        if self.layout == 'sparse':
+            return sparse.csr_matrix(
+                (self._data, self._indices, self._indptr),
+                shape=(self.num_rows, self.dimension), copy=False
+            )
+        raise ValueError("Embedding store is empty")
+    
+    def search(
+        self,
+        job_embedding: Union[np.ndarray, sparse.spmatrix],
+        top_k: int = 10
+    ) -> List[tuple]:
+        """
+        Score every live row against a job embedding and return the best
+        
+        Args:
+            job_embedding: Embedding vector for the job description
+            top_k: Number of top matches to return
+            
+        Returns:
+            List[tuple]: List of (row_id, row, similarity_score) tuples, sorted
+                by score
+        """
+        if job_embedding is None or self.num_rows == 0:
+            raise ValueError("Job embedding and stored embeddings cannot be empty")
+            
+        try:
+            if sparse.issparse(job_embedding):
+                job_embedding = job_embedding.toarray()
+            job_vector = np.asarray(job_embedding, dtype=np.float32).ravel()
+            norm = np.linalg.norm(job_vector)
+            if norm > 0:
+                job_vector = job_vector / norm
+                
+            # Stored rows are unit length, so the dot product is the cosine
+            scores = np.asarray(self.get_embeddings() @ job_vector, dtype=np.float64)
+            scores = np.clip(scores, 0, 1)
+            scores[~self.live_mask()] = -np.inf
+            
+            top_rows, top_scores = SimilarityCalculator.get_top_k(
+                scores, min(top_k, self.num_live)
+            )
+            return [
+                (self.row_ids[row], int(row), float(score))
+                for row, score in zip(top_rows, top_scores)
+            ]
+            
+        except Exception as e:
+            raise Exception(f"Failed to search embedding store: {str(e)}")
+    
+    def get_store_info(self) -> dict:
+        """
+        Get information about the store
+        
+        Returns:
+            dict: Layout, dimension, row counts, model fingerprint and file size
+        """
+        size = sum(
+            os.path.getsize(self._file(name)) for name in os.listdir(self.path)
+            if os.path.isfile(self._file(name))
+        )
+        return {
+            'path': self.path,
+            'layout': self.layout,
+            'dimension': self.dimension,
+            'num_rows': self.num_rows,
+            'num_live': self.num_live,
+            'nnz': self.nnz,
+            'fingerprint': self.fingerprint,
+            'disk_bytes': size
+        }
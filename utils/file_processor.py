@@ -1,14 +1,110 @@
 import streamlit as st
-from typing import Union
+from typing import Callable, Iterator, List, Optional, Tuple, Union
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 import PyPDF2
 import docx
+import copy
+import hashlib
 import io
+import itertools
+import multiprocessing
+import os
+import tarfile
+import zipfile
+from utils.cache import LRUCache
+
+# Bump when extraction output changes so cached results are not reused
+EXTRACTOR_VERSION = 2
+
+# Upper bound on extraction worker processes, whatever the CPU count
+MAX_EXTRACTION_WORKERS = 4
+
+# Fewer files than this (after cache hits) are extracted in the calling
+# process; starting a pool costs more than it saves on a handful of files
+PARALLEL_MIN_FILES = 8
+
+# Archive file name suffixes, routed to zipfile or tarfile
+ZIP_SUFFIXES = ('.zip',)
+TAR_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+ARCHIVE_SUFFIXES = ZIP_SUFFIXES + TAR_SUFFIXES
+
+# Default per-archive limits, guarding against zip bombs
+ARCHIVE_MAX_MEMBERS = 10000
+ARCHIVE_MAX_BYTES = 256 * 1024 * 1024
+
+# Files queued or being extracted per worker; bounds the member bytes held
+# in memory while an archive is streamed through the pool
+IN_FLIGHT_PER_WORKER = 2
+
+class _NamedBytesIO(io.BytesIO):
+    """In-memory file with a name, standing in for an uploaded file in workers"""
+    
+    def __init__(self, name: str, data: bytes):
+        super().__init__(data)
+        self.name = name
+        self.size = len(data)
+
+# File processor held by each worker process of process_files_parallel
+_worker_processor = None
+
+
+def _init_extraction_worker(processor: 'FileProcessor'):
+    """Receive the file processor once per worker process"""
+    global _worker_processor
+    _worker_processor = processor
+
+
+def _extract_file(index: int, name: str, data: bytes) -> tuple:
+    """Extract one file inside a worker process"""
+    return _extract_with(_worker_processor, index, name, data)
+
+
+def _extract_with(
+    processor: 'FileProcessor', 
+    index: int, 
+    name: str, 
+    data: bytes
+) -> tuple:
+    """Extract one file, returning (index, content, error) instead of raising"""
+    try:
+        return index, processor._extract_content(_NamedBytesIO(name, data)), None
+    except Exception as e:
+        return index, None, str(e)
+
 
 class FileProcessor:
     """Handle processing of different file formats for resume content extraction"""
     
-    def __init__(self):
+    def __init__(
+        self, 
+        cache: Optional[LRUCache] = None, 
+        pdf_max_pages: Optional[int] = None, 
+        pdf_max_words: Optional[int] = None, 
+        archive_max_members: int = ARCHIVE_MAX_MEMBERS, 
+        archive_max_bytes: int = ARCHIVE_MAX_BYTES
+    ):
+        """
+        Initialize the file processor
+        
+        Args:
+            cache: Optional cache of extraction results, keyed by SHA-256 of
+                the file bytes and EXTRACTOR_VERSION, so unchanged uploads are
+                not extracted again on every Streamlit rerun; failures are
+                cached too, so a bad file is not retried on every rerun
+            pdf_max_pages: Stop PDF extraction after this many pages
+                (None extracts every page)
+            pdf_max_words: Stop PDF extraction after the page on which this
+                many words have been collected (None extracts every page)
+            archive_max_members: Refuse archives with more file entries
+            archive_max_bytes: Refuse archives whose files decompress to
+                more bytes in total
+        """
         self.supported_formats = ['pdf', 'txt', 'docx']
+        self.cache = cache
+        self.pdf_max_pages = pdf_max_pages
+        self.pdf_max_words = pdf_max_words
+        self.archive_max_members = archive_max_members
+        self.archive_max_bytes = archive_max_bytes
     
     def process_file(self, uploaded_file) -> str:
         """
@@ -29,34 +125,304 @@ class FileProcessor:
             if file_extension not in self.supported_formats:
                 raise ValueError(f"Unsupported file format: {file_extension}")
             
-            if file_extension == 'pdf':
-                return self._extract_pdf_text(uploaded_file)
-            elif file_extension == 'txt':
-                return self._extract_txt_text(uploaded_file)
-            elif file_extension == 'docx':
-                return self._extract_docx_text(uploaded_file)
-            else:
-                raise ValueError(f"Handler not implemented for: {file_extension}")
+            if self.cache is None:
+                return self._extract_content(uploaded_file)
+            
+            data = self._read_bytes(uploaded_file)
+            cache_key = self._cache_key(file_extension, data)
+            cached = self.cache.get(cache_key)
+            if cached is None:
+                try:
+                    cached = (
+                        self._extract_content(_NamedBytesIO(uploaded_file.name, data)),
+                        None
+                    )
+                except Exception as e:
+                    cached = (None, str(e))
+                self.cache.put(cache_key, cached)
+            
+            content, error = cached
+            if error is not None:
+                raise ValueError(error)
+            return content
                 
         except Exception as e:
             raise Exception(f"Failed to process file {uploaded_file.name}: {str(e)}")
     
-    def _extract_pdf_text(self, uploaded_file) -> str:
-        """Extract text from PDF file"""
+    def _extract_content(self, uploaded_file) -> str:
+        """Extract text with the handler of the file's format, bypassing the cache"""
+        file_extension = uploaded_file.name.split('.')[-1].lower()
+        
+        if file_extension == 'pdf':
+            return self._extract_pdf_text(uploaded_file)
+        elif file_extension == 'txt':
+            return self._extract_txt_text(uploaded_file)
+        elif file_extension == 'docx':
+            return self._extract_docx_text(uploaded_file)
+        else:
+            raise ValueError(f"Unsupported file format: {file_extension}")
+    
+    def process_files_parallel(
+        self, 
+        uploaded_files: list, 
+        n_workers: Optional[int] = None, 
+        progress_callback: Optional[Callable[[int, int, str, Optional[str]], None]] = None
+    ) -> List[dict]:
+        """
+        Extract text from many files across a process pool
+        
+        File bytes are read here and sent to workers (uploaded file objects
+        cannot be pickled). ZIP and TAR archives are streamed: each supported
+        member is decompressed and handed to the pool in turn, and at most
+        IN_FLIGHT_PER_WORKER files per worker are held in memory at once.
+        Files already in the cache, including ones that failed before, are
+        answered without a worker, and a pool of spawned processes is only
+        started for at least PARALLEL_MIN_FILES remaining files. Each
+        result is reported through progress_callback as soon as its file
+        finishes; a failing file only records its error. An archive that
+        cannot be read further (or breaks a size cap) adds one failed
+        result under its own name after the members read before that point.
+        
+        Args:
+            uploaded_files: Streamlit uploaded file objects (or any binary file
+                objects with a name), including archives
+            n_workers: Number of worker processes (defaults to the CPU count);
+                at most MAX_EXTRACTION_WORKERS are used
+            progress_callback: Called as callback(completed, total, name, error)
+                after each file, in completion order; total counts the files
+                found so far, so it grows while archives are read
+            
+        Returns:
+            List[dict]: One dict per file in input order, archive members in
+                place of their archive, with 'name', 'content' (None on
+                failure) and 'error' (None on success)
+        """
+        n_workers = min(n_workers or os.cpu_count() or 1, MAX_EXTRACTION_WORKERS)
+        names = []
+        results = []
+        cache_keys = []
+        completed = 0
+        
+        def register(name: str) -> int:
+            names.append(name)
+            results.append(None)
+            cache_keys.append(None)
+            return len(names) - 1
+        
+        def describe(index: int, error: Optional[str]) -> Optional[str]:
+            if error is None:
+                return None
+            return f"Failed to process file {names[index]}: {error}"
+        
+        def finish(index: int, content: Optional[str], error: Optional[str]):
+            nonlocal completed
+            results[index] = {'name': names[index], 'content': content, 'error': error}
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, len(names), names[index], error)
+        
+        def finish_extracted(index: int, content: Optional[str], error: Optional[str]):
+            # Failures are cached too, so a bad upload is not retried (and
+            # does not start a pool) on every Streamlit rerun
+            if cache_keys[index] is not None:
+                self.cache.put(cache_keys[index], (content, error))
+            finish(index, content, describe(index, error))
+        
+        def pending_files() -> Iterator[tuple]:
+            """Register every input file, answering those that need no extraction"""
+            for uploaded_file in uploaded_files:
+                try:
+                    if self.is_archive(uploaded_file.name):
+                        members = self.iter_archive_members(uploaded_file)
+                    else:
+                        members = [(uploaded_file.name, self._read_bytes(uploaded_file))]
+                    
+                    for name, data in members:
+                        index = register(name)
+                        extension = name.split('.')[-1].lower()
+                        if extension not in self.supported_formats:
+                            error = f"Unsupported file format: {extension}"
+                            finish(index, None, describe(index, error))
+                            continue
+                        if self.cache is not None:
+                            cache_keys[index] = self._cache_key(extension, data)
+                            cached = self.cache.get(cache_keys[index])
+                            if cached is not None:
+                                content, error = cached
+                                finish(index, content, describe(index, error))
+                                continue
+                        yield index, name, data
+                        
+                except Exception as e:
+                    finish(register(uploaded_file.name), None, str(e))
+        
+        # Caches hold a lock and stay in this process
+        worker_processor = copy.copy(self)
+        worker_processor.cache = None
+        
+        # Look ahead just far enough to decide whether a pool is worth it
+        files = pending_files()
+        head = list(itertools.islice(files, PARALLEL_MIN_FILES))
+        if n_workers == 1 or len(head) < PARALLEL_MIN_FILES:
+            for index, name, data in itertools.chain(head, files):
+                finish_extracted(*_extract_with(worker_processor, index, name, data))
+            return results
+        
+        # Spawned workers start from a fresh interpreter instead of forking
+        # the (multi-threaded) Streamlit server process
+        with ProcessPoolExecutor(
+            max_workers=n_workers, 
+            mp_context=multiprocessing.get_context('spawn'), 
+            initializer=_init_extraction_worker, 
+            initargs=(worker_processor,)
+        ) as executor:
+            in_flight = {}
+            
+            def collect():
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = in_flight.pop(future)
+                    try:
+                        finish_extracted(*future.result())
+                    except Exception as e:
+                        # e.g. a worker process died; not cached, so retried next time
+                        finish(index, None, describe(index, str(e)))
+            
+            for index, name, data in itertools.chain(head, files):
+                if len(in_flight) >= n_workers * IN_FLIGHT_PER_WORKER:
+                    collect()
+                try:
+                    in_flight[executor.submit(_extract_file, index, name, data)] = index
+                except Exception as e:
+                    # The pool broke (a worker died); report the rest as failed
+                    finish(index, None, describe(index, str(e)))
+            while in_flight:
+                collect()
+        
+        return results
+    
+    @staticmethod
+    def is_archive(file_name: str) -> bool:
+        """Whether a file name has a ZIP or TAR archive suffix"""
+        return file_name.lower().endswith(ARCHIVE_SUFFIXES)
+    
+    def iter_archive_members(self, uploaded_file) -> Iterator[Tuple[str, bytes]]:
+        """
+        Read the supported files of a ZIP or TAR archive without extracting to disk
+        
+        Members are decompressed one at a time into memory. Directories,
+        unsupported formats and hidden files (e.g. __MACOSX metadata) are
+        skipped; nested archives are not opened. Sizes are enforced on the
+        bytes actually decompressed, not on the sizes the archive declares.
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object of the archive
+            
+        Yields:
+            Tuple[str, bytes]: Name (archive/member/path) and bytes of each
+                supported member
+            
+        Raises:
+            Exception: If the archive cannot be read or exceeds
+                archive_max_members or archive_max_bytes
+        """
+        archive_name = uploaded_file.name
         try:
-            # Create a BytesIO object from the uploaded file
-            pdf_bytes = io.BytesIO(uploaded_file.read())
+            uploaded_file.seek(0)
+            members = 0
+            remaining = self.archive_max_bytes
             
-            # Create PDF reader object
-            pdf_reader = PyPDF2.PdfReader(pdf_bytes)
+            for member_name, open_member in self._archive_entries(uploaded_file):
+                members += 1
+                if members > self.archive_max_members:
+                    raise ValueError(
+                        f"more than {self.archive_max_members} files in archive"
+                    )
+                
+                base_name = os.path.basename(member_name)
+                extension = base_name.split('.')[-1].lower()
+                if (base_name.startswith('.') or '__MACOSX/' in member_name
+                        or extension not in self.supported_formats):
+                    continue
+                
+                # Read one byte past the budget to detect overflow
+                with open_member() as handle:
+                    data = handle.read(remaining + 1)
+                remaining -= len(data)
+                if remaining < 0:
+                    raise ValueError(
+                        f"files decompress to more than {self.archive_max_bytes} bytes"
+                    )
+                
+                yield f"{archive_name}/{member_name}", data
+                
+        except Exception as e:
+            raise Exception(f"Failed to read archive {archive_name}: {str(e)}")
+    
+    @staticmethod
+    def _archive_entries(archive_file) -> Iterator[tuple]:
+        """(name, opener) of each regular file, in archive order"""
+        if archive_file.name.lower().endswith(ZIP_SUFFIXES):
+            with zipfile.ZipFile(archive_file) as archive:
+                for info in archive.infolist():
+                    if not info.is_dir():
+                        yield info.filename, lambda info=info: archive.open(info)
+        else:
+            # Stream mode reads members sequentially, never seeking back
+            with tarfile.open(fileobj=archive_file, mode='r|*') as archive:
+                for info in archive:
+                    if info.isfile():
+                        yield info.name, lambda info=info: archive.extractfile(info)
+    
+    @staticmethod
+    def _read_bytes(uploaded_file) -> bytes:
+        """Read the whole file from the start"""
+        uploaded_file.seek(0)
+        return uploaded_file.read()
+    
+    def _cache_key(self, file_extension: str, data: bytes) -> str:
+        """Cache key of extracted text: content, type, extractor version and budgets"""
+        return LRUCache.make_key(
+            'extraction', str(EXTRACTOR_VERSION), file_extension,
+            f"pages={self.pdf_max_pages}", f"words={self.pdf_max_words}",
+            hashlib.sha256(data).hexdigest()
+        )
+    
+    def iter_pdf_pages(self, uploaded_file) -> Iterator[str]:
+        """
+        Extract PDF text lazily, one page at a time, within the page/word budget
+        
+        Pages are only parsed for text when the generator reaches them, so
+        stopping early (here or in the caller) skips the remaining pages.
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object (or a binary file)
             
-            # Extract text from all pages
-            text_content = []
-            for page_num in range(len(pdf_reader.pages)):
-                page = pdf_reader.pages[page_num]
-                text_content.append(page.extract_text())
+        Yields:
+            str: Text of each page, in order
+        """
+        # Create a BytesIO object from the uploaded file
+        pdf_bytes = io.BytesIO(uploaded_file.read())
+        
+        # Create PDF reader object
+        pdf_reader = PyPDF2.PdfReader(pdf_bytes)
+        
+        words = 0
+        for page_num, page in enumerate(pdf_reader.pages):
+            if self.pdf_max_pages is not None and page_num >= self.pdf_max_pages:
+                return
             
-            full_text = '\n'.join(text_content)
+            page_text = page.extract_text()
+            yield page_text
+            
+            words += len(page_text.split())
+            if self.pdf_max_words is not None and words >= self.pdf_max_words:
+                return
+    
+    def _extract_pdf_text(self, uploaded_file) -> str:
+        """Extract text from PDF file, up to the page/word budget"""
+        try:
+            full_text = '\n'.join(self.iter_pdf_pages(uploaded_file))
             
             if not full_text.strip():
                 raise ValueError("No text content found in PDF")
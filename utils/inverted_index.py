@@ -0,0 +1,263 @@
+import numpy as np
+from scipy import sparse
+from typing import Tuple, Union
+from sklearn.preprocessing import normalize
+
+class InvertedIndex:
+    """Term-level inverted index over TF-IDF vectors with MaxScore top-k retrieval"""
+    
+    def __init__(self, embeddings: sparse.spmatrix):
+        """
+        Build posting lists and per-term upper bounds from resume embeddings
+        
+        Args:
+            embeddings: Sparse matrix with one resume per row (e.g. the output
+                of EmbeddingService in sparse mode); rows are L2-normalized
+        """
+        if not sparse.issparse(embeddings):
+            raise ValueError("InvertedIndex requires sparse embeddings")
+            
+        matrix = normalize(sparse.csr_matrix(embeddings, dtype=np.float64), norm='l2')
+        self.num_documents, self.num_terms = matrix.shape
+        
+        # Column-major layout: each term's postings are a contiguous slice of
+        # doc ids (sorted ascending) and their weights
+        postings = matrix.tocsc()
+        postings.sort_indices()
+        self.posting_offsets = postings.indptr
+        self.posting_docs = postings.indices
+        self.posting_weights = postings.data
+        
+        # Largest weight of each term in any document
+        self.term_upper_bounds = np.zeros(self.num_terms)
+        non_empty = np.diff(self.posting_offsets) > 0
+        self.term_upper_bounds[non_empty] = np.maximum.reduceat(
+            self.posting_weights, self.posting_offsets[:-1][non_empty]
+        )
+    
+    def __len__(self) -> int:
+        return self.num_documents
+    
+    def _postings(self, term: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Doc ids and weights of one term's posting list"""
+        start, end = self.posting_offsets[term], self.posting_offsets[term + 1]
+        return self.posting_docs[start:end], self.posting_weights[start:end]
+    
+    def _query_terms(
+        self,
+        job_embedding: Union[np.ndarray, sparse.spmatrix]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Normalized query terms ordered by their maximum possible contribution
+        
+        Returns:
+            Tuple: Term ids, query weights and contribution upper bounds,
+                sorted by descending upper bound
+        """
+        query = sparse.csr_matrix(job_embedding, dtype=np.float64).reshape(1, -1)
+        if query.shape[1] != self.num_terms:
+            raise ValueError(
+                f"Query has {query.shape[1]} features, index has {self.num_terms}"
+            )
+        query = normalize(query, norm='l2')
+        
+        terms, weights = query.indices, query.data
+        upper_bounds = weights * self.term_upper_bounds[terms]
+        
+        # Terms that cannot contribute (negative weights or no postings) are skipped
+        useful = upper_bounds > 0
+        terms = terms[useful]
+        weights = weights[useful]
+        upper_bounds = upper_bounds[useful]
+        
+        order = np.argsort(-upper_bounds, kind='stable')
+        return terms[order], weights[order], upper_bounds[order]
+    
+    def search(
+        self,
+        job_embedding: Union[np.ndarray, sparse.spmatrix],
+        top_k: int = 10
+    ) -> Tuple[np.ndarray, np.ndarray, dict]:
+        """
+        Exact top-k cosine retrieval with MaxScore dynamic pruning
+        
+        Terms are visited in order of their maximum contribution. While the
+        remaining terms could still lift an unseen document into the top k,
+        their posting lists are scanned in full ("essential" terms). After
+        that, the remaining terms are only probed, by binary search, for
+        surviving candidates, and candidates whose score plus the remaining
+        upper bound falls below the current k-th best score are dropped.
+        
+        Only posting lists of terms in the job description are read, and
+        documents sharing no term with it (score 0) are never returned. Ties
+        are broken by lower document index, matching a stable sort of the
+        brute-force scores. TF-IDF weights are non-negative, which the
+        bounds rely on.
+        
+        Args:
+            job_embedding: Embedding vector for the job description
+            top_k: Number of top matches to return
+            
+        Returns:
+            Tuple: Document indices and scores sorted by descending score, and
+                a dict with postings scanned, probes and candidates pruned
+        """
+        try:
+            terms, weights, upper_bounds = self._query_terms(job_embedding)
+            # remaining[i] bounds what terms i.. can add to any document
+            remaining = np.append(np.cumsum(upper_bounds[::-1])[::-1], 0.0)
+            
+            scores = np.zeros(self.num_documents)
+            seen = np.zeros(self.num_documents, dtype=bool)
+            candidates = np.zeros(0, dtype=self.posting_docs.dtype)
+            stats = {'postings_scanned': 0, 'postings_probed': 0, 'pruned': 0}
+            
+            # Essential terms: scan full posting lists
+            position = 0
+            threshold = 0.0
+            while position < len(terms):
+                docs, doc_weights = self._postings(terms[position])
+                scores[docs] += weights[position] * doc_weights
+                new_docs = docs[~seen[docs]]
+                seen[new_docs] = True
+                candidates = np.concatenate([candidates, new_docs])
+                stats['postings_scanned'] += len(docs)
+                position += 1
+                
+                # Unseen documents score at most remaining[position]
+                threshold = self._kth_score(scores[candidates], top_k)
+                if remaining[position] < threshold:
+                    break
+                    
+            # Non-essential terms: probe only for candidates that can still make it
+            for position in range(position, len(terms)):
+                viable = scores[candidates] + remaining[position] >= threshold
+                stats['pruned'] += int(len(candidates) - viable.sum())
+                candidates = candidates[viable]
+                
+                docs, doc_weights = self._postings(terms[position])
+                if len(docs):
+                    slots = np.searchsorted(docs, candidates)
+                    slots = np.minimum(slots, len(docs) - 1)
+                    hits = docs[slots] == candidates
+                    scores[candidates[hits]] += (
+                        weights[position] * doc_weights[slots[hits]]
+                    )
+                stats['postings_probed'] += len(candidates)
+                
+                threshold = max(threshold, self._kth_score(scores[candidates], top_k))
+                
+            stats['candidates_scored'] = int(len(candidates))
+            
+            candidate_scores = scores[candidates]
+            order = np.lexsort((candidates, -candidate_scores))[:top_k]
+            return candidates[order], np.clip(candidate_scores[order], 0, 1), stats
+            
+        except Exception as e:
+            raise Exception(f"Failed to search inverted index: {str(e)}")
+    
+    def search_threshold(
+        self,
+        job_embedding: Union[np.ndarray, sparse.spmatrix],
+        threshold: float = 0.5
+    ) -> Tuple[np.ndarray, np.ndarray, dict]:
+        """
+        Exact retrieval of every resume scoring at least threshold
+        
+        Useful with the cutoffs of SimilarityCalculator.get_similarity_category
+        (e.g. 0.5 for "Moderate Match"). Two upper bounds on what the terms
+        not yet processed can still add to a document are combined:
+        
+        - term bounds: the sum of each remaining term's largest weight
+        - norm bound: rows are unit length, so by Cauchy-Schwarz the rest
+          adds at most |remaining query| * sqrt(1 - |document weights seen|^2)
+        
+        Posting lists are scanned only while an unseen document could still
+        reach the cutoff; after that, candidates are probed term by term and
+        dropped as soon as their score plus bound falls below it.
+        
+        Scores are accumulated term by term, so they can differ from a dense
+        dot product in the last bits. Both pruning and the final filter allow
+        1e-9 of slack: a resume scoring within 1e-9 below threshold (e.g. a
+        duplicate of the job scored at 0.9999999999999999 for threshold 1.0)
+        is returned rather than lost to rounding.
+        
+        Args:
+            job_embedding: Embedding vector for the job description
+            threshold: Minimum cosine similarity (greater than 0)
+            
+        Returns:
+            Tuple: Document indices and scores sorted by descending score, and
+                a dict with candidates pruned vs fully scored, documents never
+                touched, and postings scanned and probed
+        """
+        if threshold <= 0:
+            raise ValueError("Threshold must be greater than 0; use search for top-k")
+            
+        try:
+            terms, weights, upper_bounds = self._query_terms(job_embedding)
+            # Bounds on what terms i.. can add, by term maxima and by norm
+            remaining = np.append(np.cumsum(upper_bounds[::-1])[::-1], 0.0)
+            remaining_norm = np.sqrt(
+                np.append(np.cumsum(np.square(weights[::-1]))[::-1], 0.0)
+            )
+            # Slack so rounding never prunes a document exactly at the cutoff
+            cutoff = threshold - 1e-9
+            
+            scores = np.zeros(self.num_documents)
+            seen_norms = np.zeros(self.num_documents)
+            seen = np.zeros(self.num_documents, dtype=bool)
+            candidates = np.zeros(0, dtype=self.posting_docs.dtype)
+            stats = {'postings_scanned': 0, 'postings_probed': 0, 'pruned': 0}
+            
+            # Essential terms: scan while an unseen document could still qualify
+            position = 0
+            while (position < len(terms)
+                   and min(remaining[position], remaining_norm[position]) >= cutoff):
+                docs, doc_weights = self._postings(terms[position])
+                scores[docs] += weights[position] * doc_weights
+                seen_norms[docs] += np.square(doc_weights)
+                new_docs = docs[~seen[docs]]
+                seen[new_docs] = True
+                candidates = np.concatenate([candidates, new_docs])
+                stats['postings_scanned'] += len(docs)
+                position += 1
+                
+            # Remaining terms: prune by bound, then probe the survivors
+            for position in range(position, len(terms)):
+                norm_bounds = remaining_norm[position] * np.sqrt(
+                    np.clip(1 - seen_norms[candidates], 0, 1)
+                )
+                bounds = scores[candidates] + np.minimum(remaining[position], norm_bounds)
+                viable = bounds >= cutoff
+                stats['pruned'] += int(len(candidates) - viable.sum())
+                candidates = candidates[viable]
+                if len(candidates) == 0:
+                    break
+                    
+                docs, doc_weights = self._postings(terms[position])
+                slots = np.searchsorted(docs, candidates)
+                slots = np.minimum(slots, len(docs) - 1)
+                hits = docs[slots] == candidates
+                scores[candidates[hits]] += weights[position] * doc_weights[slots[hits]]
+                seen_norms[candidates[hits]] += np.square(doc_weights[slots[hits]])
+                stats['postings_probed'] += len(candidates)
+                
+            candidate_scores = scores[candidates]
+            matched = candidate_scores >= cutoff
+            stats['candidates_scored'] = int(len(candidates))
+            stats['never_touched'] = int(self.num_documents - seen.sum())
+            
+            candidates, candidate_scores = candidates[matched], candidate_scores[matched]
+            order = np.lexsort((candidates, -candidate_scores))
+            return candidates[order], np.clip(candidate_scores[order], 0, 1), stats
+            
+        except Exception as e:
+            raise Exception(f"Failed to run threshold query: {str(e)}")
+    
+    @staticmethod
+    def _kth_score(scores: np.ndarray, top_k: int) -> float:
+        """K-th largest score, or 0 while fewer than k documents are known"""
+        if len(scores) < top_k or top_k <= 0:
+            return 0.0
+        return float(np.partition(scores, len(scores) - top_k)[len(scores) - top_k])
@@ -0,0 +1,122 @@
+import numpy as np
+from scipy import sparse
+from typing import List, Union
+from sklearn.preprocessing import normalize
+
+SUPPORTED_PRECISIONS = ('float32', 'float16', 'int8')
+
+class QuantizedEmbeddings:
+    """Reduced-precision copy of an embedding matrix for approximate candidate retrieval"""
+
+    def __init__(
+        self,
+        embeddings: Union[List[np.ndarray], np.ndarray, sparse.spmatrix],
+        precision: str = 'int8',
+        block_size: int = 8192
+    ):
+        """
+        Quantize embeddings for storage and fast approximate scoring
+
+        Rows are L2-normalized first, so dot products approximate cosine
+        similarity. int8 stores one float32 scale per vector (max |x| / 127).
+        Sparse matrices keep their structure and only quantize stored values.
+
+        Args:
+            embeddings: List of vectors, a 2D array, or a sparse matrix
+            precision: One of 'float32', 'float16' or 'int8'
+            block_size: Rows converted back to float32 at a time while scoring
+        """
+        if precision not in SUPPORTED_PRECISIONS:
+            raise ValueError(
+                f"Unsupported precision: {precision} "
+                f"(expected one of {SUPPORTED_PRECISIONS})"
+            )
+
+        self.precision = precision
+        self.block_size = block_size
+        self.is_sparse = sparse.issparse(embeddings)
+
+        if self.is_sparse:
+            matrix = sparse.csr_matrix(embeddings, dtype=np.float32)
+            matrix = normalize(matrix, norm='l2')
+            self.shape = matrix.shape
+            self.indices = matrix.indices
+            self.indptr = matrix.indptr
+            self.scales = self._row_scales(matrix)
+
+            # Expand per-row scales to one entry per stored value
+            value_scales = np.repeat(self.scales, np.diff(matrix.indptr))
+            self.values = self._quantize(matrix.data, value_scales)
+        else:
+            matrix = np.asarray(np.vstack(embeddings), dtype=np.float32)
+            matrix = normalize(matrix, norm='l2')
+            self.shape = matrix.shape
+            self.scales = self._row_scales(matrix)
+            self.values = self._quantize(matrix, self.scales[:, None])
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the quantized representation in bytes"""
+        total = self.values.nbytes + self.scales.nbytes
+        if self.is_sparse:
+            total += self.indices.nbytes + self.indptr.nbytes
+        return total
+
+    def _row_scales(self, matrix: Union[np.ndarray, sparse.csr_matrix]) -> np.ndarray:
+        """Per-row scale factors; only int8 needs them, others use 1.0"""
+        if self.precision != 'int8':
+            return np.ones(matrix.shape[0], dtype=np.float32)
+
+        if sparse.issparse(matrix):
+            max_abs = np.asarray(abs(matrix).max(axis=1).todense()).ravel()
+        else:
+            max_abs = np.abs(matrix).max(axis=1)
+
+        # All-zero rows keep a scale of 1 to avoid dividing by zero
+        scales = np.where(max_abs > 0, max_abs / 127.0, 1.0)
+        return scales.astype(np.float32)
+
+    def _quantize(self, values: np.ndarray, scales: np.ndarray) -> np.ndarray:
+        """Convert float32 values to the storage precision"""
+        if self.precision == 'int8':
+            return np.clip(np.rint(values / scales), -127, 127).astype(np.int8)
+        return values.astype(self.precision)
+
+    def dot(self, query: Union[np.ndarray, sparse.spmatrix]) -> np.ndarray:
+        """
+        Approximate dot products between every stored row and a query vector
+
+        Args:
+            query: Query embedding (dense vector or 1-row sparse matrix)
+
+        Returns:
+            np.ndarray: One approximate score per stored row
+        """
+        if sparse.issparse(query):
+            query = query.toarray()
+        query = np.asarray(query, dtype=np.float32).ravel()
+
+        norm = np.linalg.norm(query)
+        if norm > 0:
+            query = query / norm
+
+        # Dequantize one block at a time so float32 copies stay bounded
+        scores = np.empty(self.shape[0], dtype=np.float32)
+        for start in range(0, self.shape[0], self.block_size):
+            end = min(start + self.block_size, self.shape[0])
+            if self.is_sparse:
+                # Rows start..end are one contiguous slice of the stored values
+                first, last = self.indptr[start], self.indptr[end]
+                block = sparse.csr_matrix(
+                    (self.values[first:last].astype(np.float32),
+                     self.indices[first:last],
+                     self.indptr[start:end + 1] - first),
+                    shape=(end - start, self.shape[1])
+                )
+            else:
+                block = self.values[start:end].astype(np.float32)
+            scores[start:end] = block @ query
+        return scores * self.scales
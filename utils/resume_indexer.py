@@ -0,0 +1,229 @@
+from typing import Callable, Dict, List, Optional
+import hashlib
+import json
+import os
+from utils.embedding_service import EmbeddingService
+from utils.embedding_store import EmbeddingStore
+from utils.file_processor import MAX_EXTRACTION_WORKERS, FileProcessor, _NamedBytesIO
+
+# Manifest of indexed files, kept next to the store files
+MANIFEST_FILE = 'ingest_manifest.json'
+
+class ResumeIndexer:
+    """Incrementally mirror a resume directory into an embedding store"""
+    
+    def __init__(
+        self,
+        directory: str,
+        store: EmbeddingStore,
+        embedding_service: EmbeddingService,
+        file_processor: Optional[FileProcessor] = None,
+        batch_size: int = 500
+    ):
+        """
+        Initialize the indexer
+        
+        The manifest records the mtime, size and SHA-256 of every indexed
+        file, keyed by its path relative to directory (which is also the
+        row id in the store). A file whose mtime and size are unchanged is
+        skipped without being read; one whose content hash is unchanged is
+        not extracted again.
+        
+        Args:
+            directory: Directory scanned recursively for resumes
+            store: Store receiving the embeddings; its manifest lives in
+                the store directory
+            embedding_service: Fitted service with a fixed model (e.g.
+                loaded with from_saved_vectorizer) so stored rows stay
+                comparable across runs
+            file_processor: Processor used for extraction (a default one is
+                created if omitted)
+            batch_size: Files extracted and appended per batch; the manifest
+                is saved after each batch, so an interrupted run resumes
+        """
+        if not embedding_service.is_fitted:
+            raise ValueError("Embedding service must be fitted before indexing")
+            
+        self.directory = directory
+        self.store = store
+        self.embedding_service = embedding_service
+        self.file_processor = file_processor or FileProcessor()
+        self.batch_size = batch_size
+        self.manifest_path = os.path.join(store.path, MANIFEST_FILE)
+        self.manifest = self._load_manifest()
+    
+    def _load_manifest(self) -> Dict[str, dict]:
+        """Entries of the files indexed by earlier runs"""
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as manifest_file:
+                return json.load(manifest_file)
+        except Exception as e:
+            raise Exception(f"Failed to read ingestion manifest: {str(e)}")
+    
+    def _save_manifest(self):
+        """Atomically replace the manifest"""
+        temp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(self.manifest, manifest_file, indent=2, sort_keys=True)
+            manifest_file.flush()
+            os.fsync(manifest_file.fileno())
+        os.replace(temp_path, self.manifest_path)
+    
+    def scan(self) -> Dict[str, os.stat_result]:
+        """
+        Find the supported files under the directory
+        
+        Returns:
+            Dict[str, os.stat_result]: File status by path relative to the
+                directory (with forward slashes)
+        """
+        found = {}
+        for root, _, filenames in os.walk(self.directory):
+            for filename in sorted(filenames):
+                extension = filename.split('.')[-1].lower()
+                if filename.startswith('.') or (
+                        extension not in self.file_processor.supported_formats):
+                    continue
+                    
+                path = os.path.join(root, filename)
+                relative_path = os.path.relpath(path, self.directory)
+                found[relative_path.replace(os.sep, '/')] = os.stat(path)
+        return found
+    
+    def sync(
+        self,
+        n_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None
+    ) -> dict:
+        """
+        Bring the store in line with the directory
+        
+        New and changed files are extracted and appended; the rows of
+        changed and removed files are tombstoned. Rows of a file are always
+        tombstoned before its new row is appended, so re-running after an
+        interruption never leaves two live rows for one file.
+        
+        Args:
+            n_workers: Worker processes for embedding (defaults to the CPU
+                count); extraction uses at most MAX_EXTRACTION_WORKERS of them
+            progress_callback: Called as callback(processed, total) after
+                each batch of new or changed files
+                
+        Returns:
+            dict: Counts of scanned, unchanged, added, updated, removed and
+                failed files, plus an error message by path of each failed one
+                
+        Raises:
+            Exception: If the store or manifest cannot be updated
+        """
+        found = self.scan()
+        stats = {
+            'scanned': len(found), 'unchanged': 0, 'added': 0, 'updated': 0,
+            'removed': 0, 'failed': 0, 'errors': {}
+        }
+        
+        removed = sorted(set(self.manifest) - set(found))
+        if removed:
+            self.store.delete_ids(removed)
+            for relative_path in removed:
+                del self.manifest[relative_path]
+            self._save_manifest()
+            stats['removed'] = len(removed)
+            
+        candidates = []
+        for relative_path, status in found.items():
+            entry = self.manifest.get(relative_path)
+            if (entry and entry['mtime_ns'] == status.st_mtime_ns
+                    and entry['size'] == status.st_size):
+                stats['unchanged'] += 1
+                continue
+            candidates.append(relative_path)
+            
+        for start in range(0, len(candidates), self.batch_size):
+            self._sync_batch(candidates[start:start + self.batch_size], found,
+                             n_workers, stats)
+            if progress_callback:
+                progress_callback(min(start + self.batch_size, len(candidates)),
+                                  len(candidates))
+                                  
+        return stats
+    
+    def _sync_batch(
+        self,
+        relative_paths: List[str],
+        found: Dict[str, os.stat_result],
+        n_workers: Optional[int],
+        stats: dict
+    ):
+        """Re-index one batch of files whose mtime or size changed"""
+        files = []
+        hashes = {}
+        for relative_path in relative_paths:
+            path = os.path.join(self.directory, relative_path)
+            try:
+                with open(path, 'rb') as resume_file:
+                    data = resume_file.read()
+            except OSError as e:
+                # e.g. removed between the scan and now; retried next run
+                stats['failed'] += 1
+                stats['errors'][relative_path] = str(e)
+                continue
+                
+            hashes[relative_path] = hashlib.sha256(data).hexdigest()
+            entry = self.manifest.get(relative_path)
+            if entry and entry['sha256'] == hashes[relative_path]:
+                # Touched but not modified: only the manifest needs updating
+                self.manifest[relative_path] = self._entry(
+                    found[relative_path], hashes[relative_path], entry.get('error'))
+                stats['unchanged'] += 1
+                continue
+            files.append(_NamedBytesIO(relative_path, data))
+            
+        try:
+            extracted = self.file_processor.process_files_parallel(
+                files, n_workers=min(n_workers or os.cpu_count() or 1,
+                                     MAX_EXTRACTION_WORKERS))
+                
+            indexed_paths, texts = [], []
+            for result in extracted:
+                relative_path = result['name']
+                error = result['error']
+                if error is None and not result['content'].strip():
+                    error = "No text content found"
+                if error is not None:
+                    stats['failed'] += 1
+                    stats['errors'][relative_path] = error
+                else:
+                    indexed_paths.append(relative_path)
+                    texts.append(result['content'])
+                    # Only files that had a row before count as updated
+                    entry = self.manifest.get(relative_path)
+                    stats['updated' if entry and entry['error'] is None else 'added'] += 1
+                    
+                # Unreadable files are recorded too, so they are only retried
+                # once they change
+                self.manifest[relative_path] = self._entry(
+                    found[relative_path], hashes[relative_path], error)
+                    
+            # Tombstone first: a file's old row must never outlive its new one
+            self.store.delete_ids([file.name for file in files])
+            if texts:
+                embeddings, _ = self.embedding_service.generate_embeddings_parallel(
+                    texts, n_workers=n_workers)
+                self.store.append(embeddings, row_ids=indexed_paths)
+            self._save_manifest()
+            
+        except Exception as e:
+            raise Exception(f"Failed to index resume batch: {str(e)}")
+    
+    @staticmethod
+    def _entry(status: os.stat_result, sha256: str, error: Optional[str]) -> dict:
+        """Manifest entry of one file"""
+        return {
+            'mtime_ns': status.st_mtime_ns,
+            'size': status.st_size,
+            'sha256': sha256,
+            'error': error
+        }
@@ -0,0 +1,217 @@
+import numpy as np
+from typing import Sequence, Union
+
+# Score thresholds counted by calculate_similarity_statistics
+SCORE_THRESHOLDS = (0.7, 0.5, 0.3)
+
+class StreamingStatistics:
+    """Single-pass summary statistics for score arrays fed block by block"""
+    
+    def __init__(
+        self,
+        bins: int = 20,
+        value_range: tuple = (0.0, 1.0),
+        compression: float = 200.0,
+        buffer_size: int = 10000
+    ):
+        """
+        Initialize an empty accumulator
+        
+        Moments use Welford/Chan updates, the histogram has fixed bins, and
+        quantiles come from a merging t-digest: values are buffered, then
+        compressed into roughly compression / 2 weighted centroids, with
+        smaller centroids near the tails. Until more than buffer_size
+        values have been seen nothing is compressed and quantiles are exact.
+        
+        Args:
+            bins: Number of equal-width histogram bins
+            value_range: (low, high) range of the histogram; values outside
+                it are counted in the first or last bin
+            compression: t-digest compression; higher is more accurate
+            buffer_size: Values buffered before compressing into centroids
+        """
+        self.bins = bins
+        self.value_range = value_range
+        self.compression = compression
+        self.buffer_size = buffer_size
+        
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.histogram = np.zeros(bins, dtype=np.int64)
+        self.above_counts = {threshold: 0 for threshold in SCORE_THRESHOLDS}
+        
+        self._centroid_means = np.zeros(0)
+        self._centroid_weights = np.zeros(0)
+        self._buffer = []
+        self._buffered = 0
+    
+    def update(self, scores: Union[Sequence[float], np.ndarray]):
+        """
+        Add a block of scores
+        
+        Args:
+            scores: Any number of scores; NaNs are ignored
+        """
+        block = np.asarray(scores, dtype=np.float64).ravel()
+        block = block[~np.isnan(block)]
+        if len(block) == 0:
+            return
+            
+        # Chan et al. parallel update of count, mean and sum of squared deviations
+        block_count = len(block)
+        block_mean = block.mean()
+        block_m2 = np.square(block - block_mean).sum()
+        total = self.count + block_count
+        delta = block_mean - self.mean
+        self.mean += delta * block_count / total
+        self._m2 += block_m2 + delta * delta * self.count * block_count / total
+        self.count = total
+        
+        self.min = min(self.min, float(block.min()))
+        self.max = max(self.max, float(block.max()))
+        
+        low, high = self.value_range
+        positions = np.floor((block - low) / (high - low) * self.bins).astype(np.int64)
+        self.histogram += np.bincount(
+            np.clip(positions, 0, self.bins - 1), minlength=self.bins
+        )
+        
+        for threshold in self.above_counts:
+            self.above_counts[threshold] += int(np.count_nonzero(block > threshold))
+            
+        self._buffer.append(block)
+        self._buffered += block_count
+        if self._buffered > self.buffer_size:
+            self._compress()
+    
+    def merge(self, other: 'StreamingStatistics'):
+        """
+        Fold another accumulator (e.g. from another worker) into this one
+        
+        Args:
+            other: Accumulator with the same bins and value range
+        """
+        if other.bins != self.bins or other.value_range != self.value_range:
+            raise ValueError("Cannot merge statistics with different histograms")
+        if other.count == 0:
+            return
+            
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta * delta * self.count * other.count / total
+        self.count = total
+        
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.histogram += other.histogram
+        for threshold in self.above_counts:
+            self.above_counts[threshold] += other.above_counts[threshold]
+            
+        means, weights = other._digest()
+        self._centroid_means = np.concatenate([self._centroid_means, means])
+        self._centroid_weights = np.concatenate([self._centroid_weights, weights])
+        if self.count > self.buffer_size:
+            self._compress()
+    
+    def _digest(self) -> tuple:
+        """Centroid means and weights, sorted, including buffered values"""
+        means = np.concatenate([self._centroid_means] + self._buffer)
+        weights = np.concatenate(
+            [self._centroid_weights] + [np.ones(len(block)) for block in self._buffer]
+        )
+        order = np.argsort(means, kind='stable')
+        return means[order], weights[order]
+    
+    def _compress(self):
+        """Merge buffered values and centroids into at most ~compression / 2 centroids"""
+        means, weights = self._digest()
+        self._buffer = []
+        self._buffered = 0
+        
+        # k1 scale function k(q) = compression / (2 pi) * arcsin(2q - 1): a
+        # centroid may only span one unit of k, measured from its own left
+        # edge, which keeps centroids small where q is near 0 or 1 and stops
+        # existing centroids from growing with every compression
+        cumulative = np.cumsum(weights)
+        total = cumulative[-1]
+        scale = self.compression / (2 * np.pi)
+        starts = []
+        start = 0
+        while start < len(means):
+            q_left = (cumulative[start] - weights[start]) / total
+            k_limit = scale * np.arcsin(2 * q_left - 1) + 1
+            q_limit = (np.sin(min(k_limit / scale, np.pi / 2)) + 1) / 2
+            end = np.searchsorted(cumulative, q_limit * total, side='right')
+            starts.append(start)
+            start = max(end, start + 1)
+        
+        group_weights = np.add.reduceat(weights, starts)
+        self._centroid_means = np.add.reduceat(means * weights, starts) / group_weights
+        self._centroid_weights = group_weights
+    
+    def quantile(self, q: float) -> float:
+        """
+        Approximate quantile of all scores seen so far
+        
+        Args:
+            q: Quantile between 0 and 1
+            
+        Returns:
+            float: Estimated q-quantile (exact until buffer_size is exceeded)
+        """
+        if self.count == 0:
+            return float('nan')
+            
+        # Raw values sorted next to a wide centroid sit at the wrong rank, so
+        # fold them in first once a digest exists
+        if self._buffer and len(self._centroid_means):
+            self._compress()
+        means, weights = self._digest()
+        # Each centroid's mass is centred on its mean; min and max pin the ends
+        positions = np.cumsum(weights) - weights / 2
+        return float(np.interp(
+            q * self.count,
+            np.concatenate([[0.0], positions, [self.count]]),
+            np.concatenate([[self.min], means, [self.max]])
+        ))
+    
+    @property
+    def variance(self) -> float:
+        """Population variance of all scores seen so far"""
+        return self._m2 / self.count if self.count else float('nan')
+    
+    def get_histogram(self) -> tuple:
+        """
+        Get the fixed-bin histogram
+        
+        Returns:
+            tuple: Counts per bin and the bin edges
+        """
+        low, high = self.value_range
+        return self.histogram.copy(), np.linspace(low, high, self.bins + 1)
+    
+    def get_statistics(self) -> dict:
+        """
+        Summary in the format of SimilarityCalculator.calculate_similarity_statistics
+        
+        Returns:
+            dict: Statistics including mean, std, min, max, median, etc.
+        """
+        if self.count == 0:
+            return {}
+            
+        return {
+            'mean': float(self.mean),
+            'std': float(np.sqrt(self.variance)),
+            'min': float(self.min),
+            'max': float(self.max),
+            'median': self.quantile(0.5),
+            'count': self.count,
+            'above_70_percent': self.above_counts[0.7],
+            'above_50_percent': self.above_counts[0.5],
+            'above_30_percent': self.above_counts[0.3]
+        }
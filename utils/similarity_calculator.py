@@ -1,6 +1,14 @@
 import numpy as np
-from typing import List, Union
+from scipy import sparse
+from typing import List, Optional, Tuple, Union
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+from sklearn.utils.extmath import row_norms
+from threadpoolctl import threadpool_limits
+from concurrent.futures import ThreadPoolExecutor
+import queue
+from utils.quantization import QuantizedEmbeddings
+from utils.score_statistics import StreamingStatistics
 
 class SimilarityCalculator:
     """Calculate similarity scores between embeddings"""
@@ -11,15 +19,16 @@ class SimilarityCalculator:
     
     def calculate_similarities(
         self, 
-        job_embedding: np.ndarray, 
-        resume_embeddings: List[np.ndarray]
+        job_embedding: Union[np.ndarray, sparse.spmatrix], 
+        resume_embeddings: Union[List[np.ndarray], sparse.spmatrix]
     ) -> List[float]:
         """
         Calculate cosine similarities between job embedding and resume embeddings
         
         Args:
             job_embedding: Embedding vector for the job description
-            resume_embeddings: List of embedding vectors for resumes
+            resume_embeddings: List of embedding vectors for resumes, or a sparse
+                matrix with one resume per row
             
         Returns:
             List[float]: List of similarity scores (0-1 range)
@@ -27,10 +36,15 @@ class SimilarityCalculator:
         Raises:
             Exception: If similarity calculation fails
         """
-        if job_embedding is None or len(resume_embeddings) == 0:
+        if job_embedding is None or self._num_embeddings(resume_embeddings) == 0:
             raise ValueError("Job embedding and resume embeddings cannot be empty")
         
         try:
+            if sparse.issparse(resume_embeddings):
+                return self._calculate_sparse_similarities(
+                    job_embedding, resume_embeddings
+                )
+            
             # Ensure job embedding is 2D for sklearn
             if job_embedding.ndim == 1:
                 job_embedding = job_embedding.reshape(1, -1)
@@ -49,25 +63,183 @@ class SimilarityCalculator:
         except Exception as e:
             raise Exception(f"Failed to calculate similarities: {str(e)}")
     
+    def _calculate_sparse_similarities(
+        self, 
+        job_embedding: Union[np.ndarray, sparse.spmatrix], 
+        resume_matrix: sparse.spmatrix
+    ) -> List[float]:
+        """Score a sparse resume matrix with a dot product on L2-normalized rows"""
+        if sparse.issparse(job_embedding):
+            job_vector = sparse.csr_matrix(job_embedding)
+        else:
+            job_vector = sparse.csr_matrix(np.asarray(job_embedding).reshape(1, -1))
+        
+        # Cosine similarity is the dot product of unit-length rows
+        job_vector = normalize(job_vector, norm='l2')
+        resume_matrix = normalize(sparse.csr_matrix(resume_matrix), norm='l2')
+        
+        similarities = (resume_matrix @ job_vector.T).toarray().ravel()
+        
+        # Ensure all similarities are between 0 and 1
+        similarities = np.clip(similarities, 0, 1)
+        
+        return similarities.tolist()
+    
+    def calculate_similarities_chunked(
+        self, 
+        job_embedding: Union[np.ndarray, sparse.spmatrix], 
+        resume_embeddings: Union[List[np.ndarray], np.ndarray, sparse.spmatrix], 
+        block_size: int = 4096, 
+        n_threads: int = 1, 
+        split: str = 'blocks', 
+        statistics: Optional[StreamingStatistics] = None
+    ) -> np.ndarray:
+        """
+        Cosine similarities computed block by block with bounded memory
+        
+        Unlike calculate_similarities, resumes are never stacked into one
+        matrix. A list of vectors is copied block_size rows at a time into a
+        preallocated buffer that is reused for every block (one buffer per
+        thread); 2D arrays, memory maps and sparse matrices are sliced
+        without a buffer. Row norms are computed per block and divided into
+        the dot products, so no normalized copy is made either.
+        
+        Threading is explicit: with split='blocks', n_threads workers score
+        blocks concurrently and BLAS is limited to one thread each; with
+        split='blas', blocks are scored in order and BLAS uses n_threads.
+        The BLAS limit is process-wide while the call runs.
+        
+        Args:
+            job_embedding: Embedding vector for the job description
+            resume_embeddings: List of vectors, a 2D array, or a sparse matrix
+                with one resume per row
+            block_size: Resumes scored per block (at least 1)
+            n_threads: Total number of threads to use (at least 1)
+            split: 'blocks' to parallelize over blocks, 'blas' to parallelize
+                inside each matrix product
+            statistics: Optional accumulator fed each block of scores in order
+            
+        Returns:
+            np.ndarray: Similarity score per resume (0-1 range)
+        """
+        if split not in ('blocks', 'blas'):
+            raise ValueError(f"Unsupported split: {split}")
+        if n_threads < 1 or block_size < 1:
+            raise ValueError("n_threads and block_size must be at least 1")
+        num_resumes = self._num_embeddings(resume_embeddings)
+        if job_embedding is None or num_resumes == 0:
+            raise ValueError("Job embedding and resume embeddings cannot be empty")
+        
+        try:
+            if sparse.issparse(job_embedding):
+                job_embedding = job_embedding.toarray()
+            job_vector = np.asarray(job_embedding).ravel()
+            job_norm = np.linalg.norm(job_vector)
+            if job_norm > 0:
+                job_vector = job_vector / job_norm
+            
+            if sparse.issparse(resume_embeddings):
+                resume_embeddings = sparse.csr_matrix(resume_embeddings)
+            stack_rows = isinstance(resume_embeddings, list)
+            if stack_rows:
+                first_row = np.asarray(resume_embeddings[0]).ravel()
+                dtype = np.result_type(first_row.dtype, np.float32)
+            else:
+                dtype = np.result_type(resume_embeddings.dtype, np.float32)
+            # Match the resume precision so blocks are not upcast per product
+            job_vector = job_vector.astype(dtype)
+            
+            # Reusable block buffers, only needed to stack lists of vectors
+            workers = n_threads if split == 'blocks' else 1
+            buffers = queue.Queue()
+            if stack_rows:
+                for _ in range(workers):
+                    buffers.put(np.empty(
+                        (min(block_size, num_resumes), len(first_row)), dtype=dtype
+                    ))
+            
+            similarities = np.zeros(num_resumes)
+            
+            def score_block(start: int) -> Tuple[int, int]:
+                end = min(start + block_size, num_resumes)
+                buffer = buffers.get() if stack_rows else None
+                try:
+                    if stack_rows:
+                        block = buffer[:end - start]
+                        np.stack(
+                            [np.ravel(row) for row in resume_embeddings[start:end]],
+                            out=block
+                        )
+                    else:
+                        block = resume_embeddings[start:end]
+                    
+                    dots = np.asarray(block @ job_vector, dtype=np.float64).ravel()
+                    norms = row_norms(block)
+                    np.divide(dots, norms, out=similarities[start:end], where=norms > 0)
+                finally:
+                    if stack_rows:
+                        buffers.put(buffer)
+                return start, end
+            
+            starts = range(0, num_resumes, block_size)
+            blas_threads = 1 if split == 'blocks' else n_threads
+            executor = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+            try:
+                with threadpool_limits(limits=blas_threads, user_api='blas'):
+                    # Both maps yield blocks in order as they finish
+                    if executor:
+                        spans = executor.map(score_block, starts)
+                    else:
+                        spans = map(score_block, starts)
+                    
+                    # Ensure all similarities are between 0 and 1
+                    for start, end in spans:
+                        block_scores = similarities[start:end]
+                        np.clip(block_scores, 0, 1, out=block_scores)
+                        if statistics is not None:
+                            statistics.update(block_scores)
+            finally:
+                if executor:
+                    executor.shutdown()
+            
+            return similarities
+            
+        except Exception as e:
+            raise Exception(f"Failed to calculate chunked similarities: {str(e)}")
+    
+    @staticmethod
+    def _num_embeddings(embeddings: Union[List[np.ndarray], sparse.spmatrix]) -> int:
+        """Number of embeddings in a list or rows in a matrix"""
+        if sparse.issparse(embeddings):
+            return embeddings.shape[0]
+        return len(embeddings)
+    
     def calculate_pairwise_similarities(
         self, 
-        embeddings: List[np.ndarray]
+        embeddings: Union[List[np.ndarray], sparse.spmatrix]
     ) -> np.ndarray:
         """
         Calculate pairwise similarities between all embeddings
         
+        Allocates a dense n x n matrix; for large pools use
+        calculate_pairwise_neighbors.
+        
         Args:
-            embeddings: List of embedding vectors
+            embeddings: List of embedding vectors, or a sparse matrix with one
+                embedding per row
             
         Returns:
             np.ndarray: Matrix of pairwise similarities
         """
-        if len(embeddings) < 2:
+        if self._num_embeddings(embeddings) < 2:
             raise ValueError("Need at least 2 embeddings for pairwise calculation")
         
         try:
-            # Convert to matrix
-            embedding_matrix = np.vstack(embeddings)
+            # Convert to matrix (sparse input is scored as-is by sklearn)
+            if sparse.issparse(embeddings):
+                embedding_matrix = embeddings
+            else:
+                embedding_matrix = np.vstack(embeddings)
             
             # Calculate pairwise cosine similarities
             similarity_matrix = cosine_similarity(embedding_matrix)
@@ -77,6 +249,215 @@ class SimilarityCalculator:
         except Exception as e:
             raise Exception(f"Failed to calculate pairwise similarities: {str(e)}")
     
+    def calculate_pairwise_neighbors(
+        self, 
+        embeddings: Union[List[np.ndarray], np.ndarray, sparse.spmatrix], 
+        threshold: Optional[float] = None, 
+        top_k: Optional[int] = None, 
+        tile_size: int = 2048
+    ) -> sparse.csr_matrix:
+        """
+        Sparse pairwise similarities for large pools, computed tile by tile
+        
+        Unlike calculate_pairwise_similarities, the n x n matrix is never
+        allocated: pairs are scored in tile_size x tile_size blocks and only
+        pairs at or above threshold, and/or each row's top_k neighbors, are
+        kept. Peak memory beyond the result is about tile_size^2 float64
+        scores. A row is never its own neighbor.
+        
+        Args:
+            embeddings: List of embedding vectors, a 2D array, or a sparse
+                matrix with one embedding per row
+            threshold: Keep pairs with cosine similarity >= threshold
+            top_k: Keep at most this many best neighbors per row (ties go to
+                the lower index)
+            tile_size: Rows and columns scored per block
+            
+        Returns:
+            sparse.csr_matrix: n x n float32 similarities of the kept pairs
+        """
+        num_embeddings = self._num_embeddings(embeddings)
+        if num_embeddings < 2:
+            raise ValueError("Need at least 2 embeddings for pairwise calculation")
+        if threshold is None and top_k is None:
+            raise ValueError("Specify a threshold, top_k, or both")
+        
+        try:
+            matrix = normalize(self._as_matrix(embeddings), norm='l2')
+            top_k = None if top_k is None else min(top_k, num_embeddings - 1)
+            rows, columns, values = [], [], []
+            
+            for row_start in range(0, num_embeddings, tile_size):
+                row_tile = matrix[row_start:row_start + tile_size]
+                num_rows = row_tile.shape[0]
+                row_ids = np.arange(row_start, row_start + num_rows)
+                top_indices = np.zeros((num_rows, 0), dtype=np.int64)
+                top_scores = np.zeros((num_rows, 0))
+                
+                # Threshold-only results are symmetric: score the upper
+                # triangle of tiles and mirror it
+                first_column = row_start if top_k is None else 0
+                
+                for column_start in range(first_column, num_embeddings, tile_size):
+                    column_tile = matrix[column_start:column_start + tile_size]
+                    tile_scores = row_tile @ column_tile.T
+                    if sparse.issparse(tile_scores):
+                        tile_scores = tile_scores.toarray()
+                    tile_scores = np.asarray(tile_scores, dtype=np.float64)
+                    
+                    # Exclude self-pairs (and, when mirroring, the lower triangle)
+                    column_ids = column_start + np.arange(tile_scores.shape[1])
+                    if top_k is None:
+                        excluded = column_ids[None, :] <= row_ids[:, None]
+                    else:
+                        excluded = column_ids[None, :] == row_ids[:, None]
+                    tile_scores[excluded] = -np.inf
+                    
+                    if top_k is None:
+                        tile_rows, tile_columns = np.nonzero(tile_scores >= threshold)
+                        rows.append(tile_rows + row_start)
+                        columns.append(tile_columns + column_start)
+                        values.append(tile_scores[tile_rows, tile_columns])
+                    else:
+                        top_indices, top_scores = self._merge_block_top_k(
+                            top_indices, top_scores, tile_scores, column_start, top_k
+                        )
+                
+                if top_k is not None:
+                    keep = np.isfinite(top_scores)
+                    if threshold is not None:
+                        keep &= top_scores >= threshold
+                    rows.append(np.repeat(row_ids, keep.sum(axis=1)))
+                    columns.append(top_indices[keep])
+                    values.append(top_scores[keep])
+            
+            rows = np.concatenate(rows)
+            columns = np.concatenate(columns)
+            values = np.concatenate(values).astype(np.float32)
+            
+            if top_k is None:
+                rows, columns = (
+                    np.concatenate([rows, columns]), np.concatenate([columns, rows])
+                )
+                values = np.concatenate([values, values])
+            
+            return sparse.csr_matrix(
+                (values, (rows, columns)), shape=(num_embeddings, num_embeddings)
+            )
+            
+        except Exception as e:
+            raise Exception(f"Failed to calculate pairwise neighbors: {str(e)}")
+    
+    def calculate_pooled_similarities(
+        self, 
+        job_embedding: Union[np.ndarray, sparse.spmatrix], 
+        chunk_embeddings: Union[List[np.ndarray], np.ndarray, sparse.spmatrix], 
+        chunk_owners: np.ndarray, 
+        pooling: str = 'max', 
+        top_m: int = 3
+    ) -> List[float]:
+        """
+        Score chunked resumes and pool chunk scores into one score per resume
+        
+        Args:
+            job_embedding: Embedding vector for the job description
+            chunk_embeddings: Chunk embeddings from generate_chunk_embeddings
+            chunk_owners: Resume index of each chunk
+            pooling: 'max' for the best chunk, or 'mean' for the mean of the
+                top_m best chunks of each resume
+            top_m: Number of best chunks averaged by 'mean' pooling
+            
+        Returns:
+            List[float]: One similarity score per resume (0-1 range)
+        """
+        if pooling not in ('max', 'mean'):
+            raise ValueError(f"Unsupported pooling: {pooling}")
+        
+        chunk_scores = np.asarray(
+            self.calculate_similarities(job_embedding, chunk_embeddings)
+        )
+        
+        try:
+            chunk_owners = np.asarray(chunk_owners, dtype=np.int64)
+            num_resumes = int(chunk_owners.max()) + 1
+            
+            if pooling == 'max':
+                pooled = np.zeros(num_resumes)
+                np.maximum.at(pooled, chunk_owners, chunk_scores)
+                return pooled.tolist()
+            
+            # Order chunks by resume, best score first, then rank within resume
+            order = np.lexsort((-chunk_scores, chunk_owners))
+            sorted_owners = chunk_owners[order]
+            group_starts = np.searchsorted(sorted_owners, sorted_owners, side='left')
+            ranks = np.arange(len(order)) - group_starts
+            keep = order[ranks < top_m]
+            
+            totals = np.bincount(
+                chunk_owners[keep], weights=chunk_scores[keep], minlength=num_resumes
+            )
+            counts = np.bincount(chunk_owners[keep], minlength=num_resumes)
+            pooled = totals / np.maximum(counts, 1)
+            
+            return pooled.tolist()
+            
+        except Exception as e:
+            raise Exception(f"Failed to pool chunk similarities: {str(e)}")
+    
+    def search_quantized(
+        self, 
+        job_embedding: Union[np.ndarray, sparse.spmatrix], 
+        quantized_embeddings: QuantizedEmbeddings, 
+        full_embeddings: Optional[
+            Union[List[np.ndarray], np.ndarray, sparse.spmatrix]
+        ] = None, 
+        top_k: int = 10, 
+        rescore_candidates: int = 200
+    ) -> List[tuple]:
+        """
+        Retrieve candidates on quantized embeddings and rescore the best exactly
+        
+        Args:
+            job_embedding: Embedding vector for the job description
+            quantized_embeddings: Reduced-precision resume embeddings
+            full_embeddings: Full-precision resume embeddings in the same order,
+                used to rescore the shortlist; omit to return approximate scores
+            top_k: Number of top matches to return
+            rescore_candidates: Size of the shortlist rescored at full precision
+            
+        Returns:
+            List[tuple]: List of (index, similarity_score) tuples, sorted by score
+        """
+        if job_embedding is None or len(quantized_embeddings) == 0:
+            raise ValueError("Job embedding and resume embeddings cannot be empty")
+        
+        try:
+            approximate_scores = quantized_embeddings.dot(job_embedding)
+            
+            # Shortlist without sorting the whole pool
+            shortlist, _ = self.get_top_k(
+                approximate_scores, max(rescore_candidates, top_k)
+            )
+            
+            if full_embeddings is None:
+                shortlist_scores = np.clip(approximate_scores[shortlist], 0, 1)
+            else:
+                if sparse.issparse(full_embeddings):
+                    candidates = sparse.csr_matrix(full_embeddings)[shortlist]
+                else:
+                    candidates = [full_embeddings[i] for i in shortlist]
+                shortlist_scores = np.asarray(
+                    self.calculate_similarities(job_embedding, candidates)
+                )
+            
+            order, _ = self.get_top_k(shortlist_scores, top_k)
+            return [
+                (int(shortlist[i]), float(shortlist_scores[i])) for i in order
+            ]
+            
+        except Exception as e:
+            raise Exception(f"Failed to search quantized embeddings: {str(e)}")
+    
     def get_top_matches(
         self, 
         similarities: List[float], 
@@ -92,44 +473,200 @@ class SimilarityCalculator:
         Returns:
             List[tuple]: List of (index, similarity_score) tuples, sorted by score
         """
-        if not similarities:
+        if len(similarities) == 0:
             return []
         
-        # Create list of (index, score) tuples
-        indexed_similarities = [(i, score) for i, score in enumerate(similarities)]
+        top_indices, top_scores = self.get_top_k(np.asarray(similarities), top_k)
+        
+        return [
+            (int(index), float(score)) for index, score in zip(top_indices, top_scores)
+        ]
+    
+    def calculate_batch_top_k(
+        self, 
+        job_embeddings: Union[List[np.ndarray], np.ndarray, sparse.spmatrix], 
+        resume_embeddings: Union[List[np.ndarray], np.ndarray, sparse.spmatrix], 
+        top_k: int = 10, 
+        block_size: int = 4096, 
+        statistics: Optional[List[StreamingStatistics]] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Rank one resume pool against many job descriptions at once
+        
+        Resumes are scored in blocks with a single matrix product per block
+        (sparse x sparse or dense GEMM), and only a running top K per job is
+        kept, so at most jobs x block_size scores exist at any time instead
+        of the full jobs x resumes matrix. Results match calling
+        calculate_similarities and get_top_k once per job, including the
+        lower-index-first tie order (float32 embeddings can swap scores that
+        differ only by rounding).
+        
+        Args:
+            job_embeddings: List of job vectors, a 2D array, or a sparse
+                matrix with one job per row
+            resume_embeddings: List of resume vectors, a 2D array, or a sparse
+                matrix with one resume per row
+            top_k: Number of top matches to return per job
+            block_size: Resumes scored per matrix product
+            statistics: Optional accumulators, one per job, fed every block
+                of that job's scores
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Resume indices and scores, each of
+                shape (jobs, top_k), sorted by descending score per job
+        """
+        num_resumes = self._num_embeddings(resume_embeddings)
+        if self._num_embeddings(job_embeddings) == 0 or num_resumes == 0:
+            raise ValueError("Job embeddings and resume embeddings cannot be empty")
+        
+        try:
+            jobs = self._as_matrix(job_embeddings)
+            jobs = normalize(jobs, norm='l2')
+            num_jobs = jobs.shape[0]
+            top_k = min(top_k, num_resumes)
+            
+            top_indices = np.zeros((num_jobs, 0), dtype=np.int64)
+            top_scores = np.zeros((num_jobs, 0))
+            
+            for start in range(0, num_resumes, block_size):
+                block = self._as_matrix(resume_embeddings[start:start + block_size])
+                block = normalize(block, norm='l2')
+                
+                block_scores = jobs @ block.T
+                if sparse.issparse(block_scores):
+                    block_scores = block_scores.toarray()
+                block_scores = np.clip(np.asarray(block_scores, dtype=np.float64), 0, 1)
+                
+                if statistics is not None:
+                    for job_statistics, job_scores in zip(statistics, block_scores):
+                        job_statistics.update(job_scores)
+                
+                top_indices, top_scores = self._merge_block_top_k(
+                    top_indices, top_scores, block_scores, start, top_k
+                )
+            
+            return top_indices, top_scores
+            
+        except Exception as e:
+            raise Exception(f"Failed to calculate batch top-k matches: {str(e)}")
+    
+    @staticmethod
+    def _merge_block_top_k(
+        top_indices: np.ndarray, 
+        top_scores: np.ndarray, 
+        block_scores: np.ndarray, 
+        start: int, 
+        top_k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Fold one block of scores (columns start..) into a running per-row top K
+        
+        Ties are resolved lowest index first; the running entries must come
+        from columns before start. A top_k of 0 or less gives empty results.
+        """
+        num_rows, width = block_scores.shape
+        if top_k <= 0:
+            return top_indices[:, :0], top_scores[:, :0]
         
-        # Sort by similarity score (descending)
-        sorted_similarities = sorted(indexed_similarities, key=lambda x: x[1], reverse=True)
+        # Best K of this block per row; np.nonzero walks rows in order, so
+        # the kept columns stay ascending
+        if width > top_k:
+            kth_scores = np.partition(block_scores, width - top_k, axis=1)[
+                :, width - top_k
+            ][:, None]
+            above = block_scores > kth_scores
+            ties = block_scores == kth_scores
+            tie_slots = top_k - above.sum(axis=1, keepdims=True)
+            keep = above | (ties & (np.cumsum(ties, axis=1) <= tie_slots))
+            columns = np.nonzero(keep)[1].reshape(num_rows, top_k)
+        else:
+            columns = np.tile(np.arange(width), (num_rows, 1))
         
-        # Return top K
-        return sorted_similarities[:top_k]
+        # Running entries have lower indices than this block and are already
+        # in order, so a stable sort keeps the tie order
+        merged_indices = np.hstack([top_indices, columns + start])
+        merged_scores = np.hstack([
+            top_scores, np.take_along_axis(block_scores, columns, axis=1)
+        ])
+        order = np.argsort(-merged_scores, axis=1, kind='stable')[:, :top_k]
+        return (
+            np.take_along_axis(merged_indices, order, axis=1),
+            np.take_along_axis(merged_scores, order, axis=1)
+        )
+    
+    @staticmethod
+    def _as_matrix(
+        embeddings: Union[List[np.ndarray], np.ndarray, sparse.spmatrix]
+    ) -> Union[np.ndarray, sparse.csr_matrix]:
+        """Stack a list of vectors into a 2D array; sparse input becomes CSR"""
+        if sparse.issparse(embeddings):
+            return sparse.csr_matrix(embeddings)
+        return np.atleast_2d(np.vstack(embeddings))
     
-    def calculate_similarity_statistics(self, similarities: List[float]) -> dict:
+    @staticmethod
+    def get_top_k(scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Select the top K scores in O(n) with argpartition, then sort only those K
+        
+        Ties are broken by lower index first, the same order a stable
+        descending sort of all scores would give.
+        
+        Args:
+            scores: 1D array of scores
+            top_k: Number of top scores to return
+            
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Indices and scores of the top K,
+                sorted by descending score
+        """
+        scores = np.asarray(scores).ravel()
+        top_k = min(top_k, len(scores))
+        
+        if top_k <= 0:
+            return np.zeros(0, dtype=np.int64), scores[:0]
+        
+        # The K-th largest score; everything above it is in, ties fill the rest
+        partition = np.argpartition(-scores, top_k - 1)[:top_k]
+        kth_score = scores[partition].min()
+        above = np.flatnonzero(scores > kth_score)
+        ties = np.flatnonzero(scores == kth_score)[:top_k - len(above)]
+        candidates = np.concatenate([above, ties])
+        
+        order = np.lexsort((candidates, -scores[candidates]))
+        top_indices = candidates[order]
+        
+        return top_indices, scores[top_indices]
+    
+    def calculate_similarity_statistics(
+        self, 
+        similarities: Union[List[float], np.ndarray], 
+        block_size: int = 65536
+    ) -> dict:
         """
         Calculate statistics for similarity scores
         
+        Scores are read in blocks through a single-pass StreamingStatistics
+        accumulator, so no full-size array copy is made. The median is exact
+        up to StreamingStatistics.buffer_size scores and approximate above.
+        To avoid holding millions of scores at all, feed an accumulator
+        while scoring (see calculate_batch_top_k) and call its
+        get_statistics instead.
+        
         Args:
-            similarities: List of similarity scores
+            similarities: List or array of similarity scores
+            block_size: Scores added to the accumulator at a time
             
         Returns:
             dict: Statistics including mean, std, min, max, etc.
         """
-        if not similarities:
+        if len(similarities) == 0:
             return {}
         
-        similarities_array = np.array(similarities)
+        statistics = StreamingStatistics()
+        for start in range(0, len(similarities), block_size):
+            statistics.update(similarities[start:start + block_size])
         
-        return {
-            'mean': float(np.mean(similarities_array)),
-            'std': float(np.std(similarities_array)),
-            'min': float(np.min(similarities_array)),
-            'max': float(np.max(similarities_array)),
-            'median': float(np.median(similarities_array)),
-            'count': len(similarities),
-            'above_70_percent': int(np.sum(similarities_array > 0.7)),
-            'above_50_percent': int(np.sum(similarities_array > 0.5)),
-            'above_30_percent': int(np.sum(similarities_array > 0.3))
-        }
+        return statistics.get_statistics()
     
     @staticmethod
     def normalize_similarities(similarities: List[float]) -> List[float]:
@@ -158,6 +695,45 @@ class SimilarityCalculator:
         
         return normalized.tolist()
     
+    @staticmethod
+    def calculate_hybrid_similarities(
+        cosine_similarities: List[float], 
+        bm25_scores: List[float], 
+        max_bm25_score: float, 
+        bm25_weight: float = 0.3
+    ) -> List[float]:
+        """
+        Blend cosine similarities with BM25 keyword scores
+        
+        BM25 scores are unbounded, so they are divided by the largest score
+        the query can reach (BM25Index.max_score) before mixing. The bound
+        depends on the query, not on the pool, so a resume sharing one
+        keyword with the job stays a weak match even when it is the only
+        resume, and scores stay comparable between runs.
+        
+        Args:
+            cosine_similarities: Cosine similarity per resume (0-1 range)
+            bm25_scores: BM25 score per resume, in the same order
+            max_bm25_score: Maximum possible BM25 score for the query
+            bm25_weight: Share of the BM25 score in the blend (0-1)
+            
+        Returns:
+            List[float]: Hybrid score per resume
+        """
+        if len(cosine_similarities) != len(bm25_scores):
+            raise ValueError("Cosine and BM25 scores must have the same length")
+        
+        bm25_array = np.asarray(bm25_scores, dtype=np.float64)
+        if max_bm25_score > 0:
+            bm25_array = bm25_array / max_bm25_score
+        
+        hybrid = (
+            (1 - bm25_weight) * np.asarray(cosine_similarities, dtype=np.float64)
+            + bm25_weight * np.clip(bm25_array, 0, 1)
+        )
+        
+        return np.clip(hybrid, 0, 1).tolist()
+    
     @staticmethod
     def get_similarity_category(similarity_score: float) -> str:
         """